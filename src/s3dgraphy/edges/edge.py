@@ -1,3 +1,5 @@
+import sys
+
 # Import the connections datamodel loader
 from .connections_loader import get_connections_datamodel
 
@@ -10,6 +12,9 @@ def _build_legacy_edge_types():
     """Build a legacy EDGE_TYPES dict for backward compatibility."""
     edge_types = {}
     for edge_name in _connections_datamodel.get_all_edge_names(canonical_only=False):
+        # ✅ PERFORMANCE: nomi internati, identici ai letterali usati nel codice
+        # ("has_property", ...): confronti e lookup per identità
+        edge_name = sys.intern(edge_name)
         edge_types[edge_name] = {
             "label": _connections_datamodel.get_label(edge_name),
             "description": _connections_datamodel.get_description(edge_name)
@@ -18,6 +23,10 @@ def _build_legacy_edge_types():
 
 EDGE_TYPES = _build_legacy_edge_types()
 
+# Canonical (interned) string for each edge type, so that every Edge shares
+# one str object per type even when the type comes from parsed files
+_EDGE_TYPE_NAMES = {edge_name: edge_name for edge_name in EDGE_TYPES}
+
 class Edge:
     """
     Represents an edge in the graph, connecting two nodes with a specific relationship type.
@@ -32,15 +41,16 @@ class Edge:
     """
 
     def __init__(self, edge_id, edge_source, edge_target, edge_type):
-        if edge_type not in EDGE_TYPES:
+        edge_info = EDGE_TYPES.get(edge_type)
+        if edge_info is None:
             raise ValueError(f"Edge type '{edge_type}' is not a recognized relationship type.")
         
         self.edge_id = edge_id
         self.edge_source = edge_source
         self.edge_target = edge_target
-        self.edge_type = edge_type
-        self.label = EDGE_TYPES[edge_type]["label"]
-        self.description = EDGE_TYPES[edge_type]["description"]
+        self.edge_type = _EDGE_TYPE_NAMES.get(edge_type, edge_type)
+        self.label = edge_info["label"]
+        self.description = edge_info["description"]
 
         self.attributes = {}
 
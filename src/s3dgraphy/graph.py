@@ -34,6 +34,14 @@ class Graph:
         nodes (List[Node]): List of nodes in the graph.
         edges (List[Edge]): List of edges in the graph.
         warnings (List[str]): List to accumulate warning messages during operations.
+
+    Lookups (find_node_by_id, find_edge_by_id, has_edge, get_nodes_by_type, ...)
+    are answered from the graph indices. Use add_node/add_edge (or the bulk
+    and remove/update methods) to change the graph: they keep the indices up
+    to date. Appending to or reassigning ``nodes``/``edges`` directly is
+    detected and triggers a full rebuild on the next lookup; changing a node
+    or edge in place (e.g. its ID or type) is not, so set ``_indices_dirty``
+    to True afterwards.
     """
 
     def __init__(self, graph_id, name=None, description=None, audio=None, video=None, data=None):
@@ -51,21 +59,51 @@ class Graph:
         # Initialize graph indices
         self._indices = None
         self._indices_dirty = True
+        # Indici delle proprietà (valori dei property node) da ricalcolare
+        # al prossimo accesso a self.indices
+        self._property_indices_dirty = False
+        # (nodes, edges, len(nodes), len(edges)) all'ultimo aggiornamento degli
+        # indici: rileva modifiche dirette alle liste fatte senza i metodi del grafo
+        self._indexed_lists = None
 
         # Initialize and add geo_position node if not already present
         if not any(node.node_type == "geo_position" for node in self.nodes):
             geo_node = GeoPositionNode(node_id=f"geo_{graph_id}")
             self.add_node(geo_node, overwrite=True)
 
+    def _indices_stale(self):
+        """
+        Return True if the indices must be rebuilt before they are used.
+
+        Besides the _indices_dirty flag, checks that self.nodes/self.edges are
+        the lists last indexed and have the same length, so nodes or edges
+        appended or reassigned without the graph methods are not missed.
+        """
+        indexed = self._indexed_lists
+        return (self._indices_dirty or indexed is None
+                or indexed[0] is not self.nodes or indexed[1] is not self.edges
+                or indexed[2] != len(self.nodes) or indexed[3] != len(self.edges))
+
     @property
     def indices(self):
         """Lazy loading degli indici con rebuild automatico se necessario"""
-        if self._indices is None:
-            self._indices = GraphIndices()
-        if self._indices_dirty:
+        if self._indices is None or self._indices_stale():
             self._rebuild_indices()
+        elif self._property_indices_dirty:
+            self._rebuild_property_indices()
         return self._indices
-    
+
+    def _node_edge_indices(self):
+        """
+        Return the indices with up-to-date node and edge lookups.
+
+        Used by the lookups that run once per node/edge during imports: the
+        property indices are left to be refreshed by the indices property.
+        """
+        if self._indices is None or self._indices_stale():
+            self._rebuild_indices()
+        return self._indices
+
     def _rebuild_indices(self):
         """Ricostruisce gli indici del grafo"""
         if self._indices is None:
@@ -77,29 +115,80 @@ class Graph:
         for node in self.nodes:
             self._indices.add_node(node)
 
-            # Indicizzazione speciale per property nodes
-            node_type = getattr(node, 'node_type', None)
-            if node_type == 'property' and hasattr(node, 'name'):
-                self._indices.add_property_node(node.name, node)
-        
         # Indicizza edges
         for edge in self.edges:
             self._indices.add_edge(edge)
 
-            # Indicizzazione speciale per has_property edges
-            # ✅ FIX: Use newly built index instead of find_node_by_id() to avoid recursion
-            if edge.edge_type == 'has_property':
-                source_node = self._indices.nodes_by_id.get(edge.edge_source)
-                target_node = self._indices.nodes_by_id.get(edge.edge_target)
-                if source_node and target_node and hasattr(target_node, 'name'):
-                    prop_value = getattr(target_node, 'description', 'empty')
-                    self._indices.add_property_relation(
-                        target_node.name,
-                        edge.edge_source,
-                        prop_value
-                    )
-        
+        self._rebuild_property_indices()
         self._indices_dirty = False
+        self._indexed_lists = (self.nodes, self.edges, len(self.nodes), len(self.edges))
+
+    def _rebuild_property_indices(self):
+        """Ricostruisce gli indici delle proprietà dai nodi e dagli edge già indicizzati"""
+        indices = self._indices
+        indices.clear_property_indices()
+
+        # Indicizzazione speciale per property nodes
+        for node in self.nodes:
+            node_type = getattr(node, 'node_type', None)
+            if node_type == 'property' and hasattr(node, 'name'):
+                indices.add_property_node(node.name, node)
+
+        # Indicizzazione speciale per has_property edges (nell'ordine di self.edges)
+        # ✅ FIX: Use newly built index instead of find_node_by_id() to avoid recursion
+        nodes_by_id = indices.nodes_by_id
+        for edge in indices.edges_by_type.get('has_property', ()):
+            source_node = nodes_by_id.get(edge.edge_source)
+            target_node = nodes_by_id.get(edge.edge_target)
+            if source_node and target_node and hasattr(target_node, 'name'):
+                prop_value = getattr(target_node, 'description', 'empty')
+                indices.add_property_relation(
+                    target_node.name,
+                    edge.edge_source,
+                    prop_value
+                )
+
+        self._property_indices_dirty = False
+
+    def _index_new_nodes(self, nodes):
+        """
+        Add nodes just appended to self.nodes to the indices.
+
+        ✅ PERFORMANCE: indici aggiornati in modo incrementale, così restano
+        validi durante gli import invece di essere ricostruiti (o sostituiti da
+        scansioni lineari) ad ogni nodo. Rimozioni e modifiche sul posto
+        invece marcano gli indici come dirty.
+        """
+        if self._indices is None or self._indices_dirty:
+            return
+        indexed = self._indexed_lists
+        if (indexed[0] is not self.nodes or indexed[1] is not self.edges
+                or indexed[2] + len(nodes) != len(self.nodes)
+                or indexed[3] != len(self.edges)):
+            # Liste modificate anche al di fuori dei metodi del grafo
+            self._indices_dirty = True
+            return
+        for node in nodes:
+            self._indices.add_node(node)
+        self._indexed_lists = (self.nodes, self.edges, len(self.nodes), len(self.edges))
+        # I valori delle proprietà possono ancora cambiare: ricalcolati al
+        # prossimo accesso a self.indices, come con una ricostruzione
+        self._property_indices_dirty = True
+
+    def _index_new_edges(self, edges):
+        """Add edges just appended to self.edges to the indices (see _index_new_nodes)."""
+        if self._indices is None or self._indices_dirty:
+            return
+        indexed = self._indexed_lists
+        if (indexed[0] is not self.nodes or indexed[1] is not self.edges
+                or indexed[2] != len(self.nodes)
+                or indexed[3] + len(edges) != len(self.edges)):
+            self._indices_dirty = True
+            return
+        for edge in edges:
+            self._indices.add_edge(edge)
+        self._indexed_lists = (self.nodes, self.edges, len(self.nodes), len(self.edges))
+        self._property_indices_dirty = True
 
 
     @staticmethod
@@ -156,13 +245,101 @@ class Graph:
         if existing_node:
             if overwrite:
                 self.nodes.remove(existing_node)
+                self._indices_dirty = True  # nodo rimosso: indici da ricostruire
                 self.add_warning(f"Node '{node.node_id}' overwritten.")
             else:
                 return existing_node
         self.nodes.append(node)
-        self._indices_dirty = True  # ← Aggiunto per invalidare gli indici
+        self._index_new_nodes((node,))
         return node
 
+    def has_edge(self, edge_source: str, edge_target: str, edge_type: str) -> bool:
+        """
+        Checks whether an edge of the given type links two nodes.
+
+        Args:
+            edge_source (str): Source node ID.
+            edge_target (str): Target node ID.
+            edge_type (str): Type of edge.
+
+        Returns:
+            bool: True if such an edge exists.
+        """
+        return (edge_source, edge_target, edge_type) in self._node_edge_indices().edge_keys
+
+    def add_nodes_bulk(self, nodes) -> List[Node]:
+        """
+        Adds many nodes to the graph in a single pass.
+
+        Nodes whose ID is already in the graph (or earlier in the same batch)
+        are skipped, as add_node() does without overwrite.
+
+        Args:
+            nodes (Iterable[Node]): Nodes to add.
+
+        Returns:
+            List[Node]: The nodes actually added.
+        """
+        # ✅ PERFORMANCE: ID esistenti dall'indice del grafo (aggiornato in modo
+        # incrementale), non da un set ricostruito su tutti i nodi ad ogni batch
+        nodes_by_id = self._node_edge_indices().nodes_by_id
+        seen_ids = set()
+        added = []
+        for node in nodes:
+            if node.node_id in nodes_by_id or node.node_id in seen_ids:
+                continue
+            seen_ids.add(node.node_id)
+            added.append(node)
+
+        if added:
+            self.nodes.extend(added)
+            self._index_new_nodes(added)
+        return added
+
+    def add_edges_bulk(self, edges) -> List[Edge]:
+        """
+        Adds many edges to the graph in a single pass, with the same
+        connection validation as add_edge().
+
+        Edges whose ID is already in the graph (or earlier in the same batch)
+        are skipped.
+
+        Args:
+            edges (Iterable[tuple]): (edge_id, edge_source, edge_target, edge_type) tuples.
+
+        Returns:
+            List[Edge]: The edges actually added.
+
+        Raises:
+            ValueError: If the source or target node of any edge does not exist.
+                Nothing is added in that case.
+        """
+        indices = self._node_edge_indices()
+        nodes_by_id = indices.nodes_by_id
+        existing_ids = indices.edges_by_id
+        seen_ids = set()
+        added = []
+        for edge_id, edge_source, edge_target, edge_type in edges:
+            if edge_id in existing_ids or edge_id in seen_ids:
+                continue
+
+            source_node = nodes_by_id.get(edge_source)
+            target_node = nodes_by_id.get(edge_target)
+            if not source_node or not target_node:
+                raise ValueError(f"Both nodes with IDs '{edge_source}' and '{edge_target}' must exist.")
+
+            if not self.validate_connection(source_node.node_type, target_node.node_type, edge_type):
+                self.add_warning(f"Connection '{edge_type}' not allowed between '{source_node.node_type}' (name:{source_node.name}) and '{target_node.node_type}' (name:'{target_node.name}'). Using 'generic_connection' instead.")
+                edge_type = "generic_connection"
+
+            seen_ids.add(edge_id)
+            added.append(Edge(edge_id, edge_source, edge_target, edge_type))
+
+        if added:
+            self.edges.extend(added)
+            self._index_new_edges(added)
+        return added
+
     def add_edge(self, edge_id: str, edge_source: str, edge_target: str, edge_type: str) -> Edge:
         """
         Adds an edge to the graph with connection validation.
@@ -195,7 +372,7 @@ class Graph:
 
         edge = Edge(edge_id, edge_source, edge_target, edge_type)
         self.edges.append(edge)
-        self._indices_dirty = True  # ← Aggiunto per invalidare gli indici
+        self._index_new_edges((edge,))
         return edge
 
     def connect_paradatagroup_propertynode_to_stratigraphic(self, verbose=False):
@@ -367,24 +544,15 @@ class Graph:
     def find_node_by_id(self, node_id):
         """Finds a node by ID.
 
-        ✅ OPTIMIZATION: O(1) lookup using indices instead of O(n) iteration
+        ✅ OPTIMIZATION: O(1) lookup using indices instead of O(n) iteration.
+        The indices are rebuilt only after removals or in-place changes;
+        additions keep them up to date.
         """
-        # Use index if available (O(1) lookup)
-        if not self._indices_dirty and self._indices is not None:
-            return self._indices.nodes_by_id.get(node_id)
-
-        # Fallback to linear search if indices not ready
-        for node in self.nodes:
-            if node.node_id == node_id:
-                return node
-        return None
+        return self._node_edge_indices().nodes_by_id.get(node_id)
 
     def find_edge_by_id(self, edge_id):
-        """Finds an edge by ID."""
-        for edge in self.edges:
-            if edge.edge_id == edge_id:
-                return edge
-        return None
+        """Finds an edge by ID (O(1) lookup using indices)."""
+        return self._node_edge_indices().edges_by_id.get(edge_id)
 
     def get_connected_nodes(self, node_id):
         """Gets all nodes connected to a given node."""
@@ -415,7 +583,7 @@ class Graph:
         ✅ OPTIMIZATION: O(1) lookup using type index instead of O(n) iteration
         """
         # Use index if available (O(1) lookup)
-        if not self._indices_dirty and self._indices is not None:
+        if self._indices is not None and not self._indices_stale():
             return self._indices.nodes_by_type.get(node_type, [])
 
         # Fallback to linear search if indices not ready
@@ -425,11 +593,13 @@ class Graph:
         """Removes a node and all edges connected to it."""
         self.nodes = [node for node in self.nodes if node.node_id != node_id]
         self.edges = [edge for edge in self.edges if edge.edge_source != node_id and edge.edge_target != node_id]
+        self._indices_dirty = True
         # print(f"Node '{node_id}' and its edges removed successfully.")
 
     def remove_edge(self, edge_id):
         """Removes an edge from the graph."""
         self.edges = [edge for edge in self.edges if edge.edge_id != edge_id]
+        self._indices_dirty = True
         # print(f"Edge '{edge_id}' removed successfully.")
 
     def update_node(self, node_id, **kwargs):
@@ -439,6 +609,7 @@ class Graph:
             raise ValueError(f"Node with ID '{node_id}' not found.")
         for key, value in kwargs.items():
             setattr(node, key, value)
+        self._indices_dirty = True
         # print(f"Node '{node_id}' updated successfully.")
 
     def update_edge(self, edge_id, **kwargs):
@@ -448,6 +619,7 @@ class Graph:
             raise ValueError(f"Edge with ID '{edge_id}' not found.")
         for key, value in kwargs.items():
             setattr(edge, key, value)
+        self._indices_dirty = True
         # print(f"Edge '{edge_id}' updated successfully.")
 
 
@@ -519,7 +691,7 @@ class Graph:
         ✅ OPTIMIZATION: O(1) lookup using composite index instead of O(E) iteration
         """
         # Use composite index if available (O(1) lookup)
-        if not self._indices_dirty and self._indices is not None:
+        if self._indices is not None and not self._indices_stale():
             # Check outgoing edges (source -> target)
             source_key = (node.node_id, edge_type)
             for edge in self._indices.edges_by_source_type.get(source_key, []):
@@ -572,7 +744,7 @@ class Graph:
         connected_epoch_nodes = []
 
         # Use composite index if available (O(1) lookup)
-        if not self._indices_dirty and self._indices is not None:
+        if self._indices is not None and not self._indices_stale():
             # Check outgoing edges (source -> target)
             source_key = (node.node_id, edge_type)
             for edge in self._indices.edges_by_source_type.get(source_key, []):
@@ -1017,7 +1189,7 @@ class Graph:
         connected_nodes = []
 
         # Use composite index if available (O(1) lookup)
-        if not self._indices_dirty and self._indices is not None:
+        if self._indices is not None and not self._indices_stale():
             # Check outgoing edges (source -> target)
             source_key = (node_id, edge_type)
             for edge in self._indices.edges_by_source_type.get(source_key, []):
@@ -1080,7 +1252,7 @@ class Graph:
         combiners = []
 
         # Use index if available (O(1) lookup)
-        if not self._indices_dirty and self._indices is not None:
+        if self._indices is not None and not self._indices_stale():
             for edge in self._indices.edges_by_source.get(property_node_id, []):
                 target_node = self.find_node_by_id(edge.edge_target)
                 if target_node and target_node.node_type == "combiner":
@@ -1341,6 +1513,7 @@ class Graph:
             # Apply refinement if a rule matched
             if new_type:
                 edge.edge_type = new_type
+                self._indices_dirty = True  # edge type changed in place
                 refined_count += 1
                 if verbose:
                     print(f"✅ Refined edge {edge.edge_id}: {original_type} -> {new_type} ({source_type} -> {target_type})")
@@ -0,0 +1,24 @@
+# s3Dgraphy/importer/_excel_common.py
+
+"""
+Helpers shared by the Excel importers.
+
+Kept free of pandas/numpy so that XLSXImporter (openpyxl only) can use
+them without loading the dependencies of MappedXLSXImporter.
+"""
+
+# Celle lette come valori mancanti, come pd.read_excel(na_values=['', 'NA', 'N/A'])
+# con i valori NA di default di pandas
+_NA_VALUES = ('', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan',
+              '1.#IND', '1.#QNAN', '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None',
+              'n/a', 'nan', 'null')
+
+
+def _resolve_sheet_name(sheet_names, sheet_name) -> str:
+    """Resolve a sheet index or name from the mapping to an existing sheet name."""
+    if isinstance(sheet_name, int):
+        if 0 <= sheet_name < len(sheet_names):
+            return sheet_names[sheet_name]
+    elif sheet_name in sheet_names:
+        return sheet_name
+    raise ValueError(f"Worksheet named '{sheet_name}' not found")
@@ -4,7 +4,7 @@ from abc import ABC, abstractmethod
 import json
 import os
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterable, Optional, Tuple
 from ..graph import Graph
 from ..nodes.base_node import Node
 from ..nodes.property_node import PropertyNode
@@ -15,6 +15,13 @@ from typing import Dict, Any, Optional
 # Configurazione logging opzionale per debug
 logger = logging.getLogger(__name__)
 
+# Relazioni stratigrafiche: gestite da _process_stratigraphic_relations()
+STRATIGRAPHIC_EDGE_TYPES = frozenset({
+    'overlies', 'is_overlain_by', 'cuts', 'is_cut_by',
+    'fills', 'is_filled_by', 'abuts', 'is_abutted_by',
+    'is_bonded_to', 'is_physically_equal_to'
+})
+
 class BaseImporter(ABC):
     """
     Abstract base class for all importers.
@@ -41,11 +48,11 @@ class BaseImporter(ABC):
             # Se siamo in Blender, usa bpy.path.abspath
             import bpy
             self.filepath = bpy.path.abspath(filepath)
-            logger.debug(f"Converted filepath using bpy.path.abspath: {filepath} -> {self.filepath}")
+            logger.debug("Converted filepath using bpy.path.abspath: %s -> %s", filepath, self.filepath)
         except ImportError:
             # Se non siamo in Blender, usa os.path.abspath standard
             self.filepath = os.path.abspath(filepath)
-            logger.debug(f"Converted filepath using os.path.abspath: {filepath} -> {self.filepath}")
+            logger.debug("Converted filepath using os.path.abspath: %s -> %s", filepath, self.filepath)
         
         # Verifica che il file esista
         #if not os.path.exists(self.filepath):
@@ -57,6 +64,8 @@ class BaseImporter(ABC):
 
         # ✅ AGGIUNTA: Cache l'ID column una sola volta
         self._cached_id_column = None
+        # ✅ PERFORMANCE: Piano colonne -> proprietà, calcolato una sola volta
+        self._cached_property_plan = None
         
         # Il grafo verrà inizializzato dalla classe figlia
         #self.graph = None
@@ -67,7 +76,7 @@ class BaseImporter(ABC):
         if mapping_name is None:
             return None
             
-        logger.debug(f"Loading mapping: {mapping_name}")
+        logger.debug("Loading mapping: %s", mapping_name)
         
         # Import registry
         from ..mappings import mapping_registry
@@ -76,12 +85,12 @@ class BaseImporter(ABC):
         mapping_types = ['pyarchinit', 'emdb', 'generic']
         
         for mapping_type in mapping_types:
-            logger.debug(f"Trying mapping type: {mapping_type}")
+            logger.debug("Trying mapping type: %s", mapping_type)
             mapping = mapping_registry.load_mapping(mapping_name, mapping_type)
             if mapping:
-                logger.debug(f"Mapping loaded successfully from {mapping_type}")
-                logger.debug(f"Keys in mapping: {list(mapping.keys())}")
-                logger.debug(f"Column mappings: {list(mapping.get('column_mappings', {}).keys())}")
+                logger.debug("Mapping loaded successfully from %s", mapping_type)
+                logger.debug("Keys in mapping: %s", list(mapping))
+                logger.debug("Column mappings: %s", list(mapping.get('column_mappings', {})))
                 return mapping
         
         raise FileNotFoundError(f"Mapping file {mapping_name} not found in any registered directories")
@@ -99,17 +108,17 @@ class BaseImporter(ABC):
             return self._cached_id_column
             
         logger.debug("Getting ID column")
-        logger.debug(f"Mapping present: {self.mapping is not None}")
+        logger.debug("Mapping present: %s", self.mapping is not None)
         
         if self.mapping:
             # 🔄 Nuovo formato: cerca in column_mappings per is_id: true
             for col_name, col_config in self.mapping.get('column_mappings', {}).items():
                 if col_config.get('is_id', False):
-                    logger.debug(f"Found ID column: {col_name}")
+                    logger.debug("Found ID column: %s", col_name)
                     self._cached_id_column = col_name
                     return col_name
                     
-        logger.debug(f"Using provided id_column: {self.id_column}")
+        logger.debug("Using provided id_column: %s", self.id_column)
         
         # ✅ AGGIUNTA: Salva in cache anche l'id_column fornito
         self._cached_id_column = self.id_column
@@ -121,7 +130,7 @@ class BaseImporter(ABC):
             # 🔄 Nuovo formato: cerca in column_mappings per is_description: true
             for col_name, col_config in self.mapping.get('column_mappings', {}).items():
                 if col_config.get('is_description', False):
-                    logger.debug(f"Found description column: {col_name}")
+                    logger.debug("Found description column: %s", col_name)
                     return col_name
         return None
 
@@ -134,13 +143,13 @@ class BaseImporter(ABC):
                 column_config = self.mapping.get('column_mappings', {}).get(id_column, {})
                 node_type = column_config.get('node_type')
                 if node_type:
-                    logger.debug(f"Found node_type from ID column: {node_type}")
+                    logger.debug("Found node_type from ID column: %s", node_type)
                     return node_type
             
             # Fallback: cerca stratigraphic_type globale (formato legacy)
             strat_type = self.mapping.get('stratigraphic_type')
             if strat_type:
-                logger.debug(f"Using global stratigraphic_type: {strat_type}")
+                logger.debug("Using global stratigraphic_type: %s", strat_type)
                 return strat_type
         
         # Default
@@ -198,10 +207,59 @@ class BaseImporter(ABC):
                 return self._process_row_automatic(row_data)
                 
         except Exception as e:
-            logger.error(f"Error processing row: {e}")
-            logger.error(f"Row data: {row_data}")
+            logger.error("Error processing row: %s", e)
+            logger.error("Row data: %s", row_data)
             raise
 
+    def process_rows(self, rows: Iterable[Dict[str, Any]]) -> Tuple[int, int, int]:
+        """
+        Process a batch of rows with process_row().
+
+        Rows that produce a node are kept in self._stored_rows for the second
+        pass (epochs, relations); rows that raise are reported in the warnings
+        and do not stop the batch.
+
+        Args:
+            rows: Iterable of row dicts (column name -> non-null value)
+
+        Returns:
+            Tuple[int, int, int]: (successful, skipped, errors) row counts
+        """
+        if not hasattr(self, '_stored_rows'):
+            self._stored_rows = []
+
+        successful = 0
+        skipped = 0
+        errors = 0
+
+        # ✅ PERFORMANCE: Bind hot-loop attributes to locals once per batch;
+        # row errors are collected locally and added to the warnings at once
+        process_row = self.process_row
+        store_row = self._stored_rows.append
+        row_errors = []
+        warn = row_errors.append
+
+        # ✅ PERFORMANCE: The try block wraps the whole loop, not each row.
+        # When a row raises, the error is recorded and the loop resumes on the
+        # same iterator from the next row, so rows are never processed twice.
+        rows = iter(rows)
+        while True:
+            try:
+                for row_data in rows:
+                    # First pass: create nodes + properties
+                    if process_row(row_data) is not None:
+                        successful += 1
+                        store_row(row_data)
+                    else:
+                        skipped += 1
+                break
+            except Exception as e:
+                errors += 1
+                warn(f"Error processing row: {str(e)}")
+
+        self.warnings.extend(row_errors)
+        return successful, skipped, errors
+
     def _process_row_mapped(self, row_data: Dict[str, Any]) -> Optional[Node]:
         """Process a row with explicit mapping configuration."""
         
@@ -332,63 +390,23 @@ class BaseImporter(ABC):
         # 🔄 Supporta sia nuovo che vecchio formato, ma in modo semplice
         if 'column_mappings' in self.mapping:
             # Formato nuovo: tutte le colonne che non sono speciali diventano proprietà
-            id_column = self._get_id_column()
-            description_column = self._get_description_column()
-
-            # Build skip set: columns handled elsewhere
-            skip_columns = set()
-
-            # 1. Relationship columns (handled in _process_stratigraphic_relations)
-            STRATIGRAPHIC_EDGE_TYPES = {
-                'overlies', 'is_overlain_by', 'cuts', 'is_cut_by',
-                'fills', 'is_filled_by', 'abuts', 'is_abutted_by',
-                'is_bonded_to', 'is_physically_equal_to'
-            }
-            for rel in self.mapping.get('relations', []):
-                if rel.get('edge_type') in STRATIGRAPHIC_EDGE_TYPES:
-                    skip_columns.add(rel['target_column'])
-
-            # 2. Epoch columns and their START/END companions (handled in _process_epochs)
-            epoch_base_columns = set()
-            for col_name, col_config in self.mapping.get('column_mappings', {}).items():
-                if col_config.get('node_type') == 'EpochNode':
-                    skip_columns.add(col_name)
-                    epoch_base_columns.add(col_name)
-            # Skip epoch START/END companion columns
-            for col_name, col_config in self.mapping.get('column_mappings', {}).items():
-                prop_name = col_config.get('property_name', '')
-                if prop_name.endswith(('Start', 'End')):
-                    base = col_name.rsplit('_', 1)[0] if '_' in col_name else col_name
-                    if base in epoch_base_columns:
-                        skip_columns.add(col_name)
-
-            for col_name, col_config in self.mapping.get('column_mappings', {}).items():
-                # Skip ID and description columns
-                if col_name in [id_column, description_column]:
-                    continue
-                if col_config.get('is_id', False) or col_config.get('is_description', False):
+            # ✅ PERFORMANCE: Skip rules are resolved once per mapping, not per row
+            for col_name, prop_name, is_attribute in self._get_property_plan():
+                if col_name not in row_data:
                     continue
-                # Skip columns handled elsewhere (relations, epochs)
-                if col_name in skip_columns:
+                value = row_data[col_name]
+                if self._is_invalid_id(value):
                     continue
 
-                # 3. Attribute columns → store as node attribute, not PropertyNode
-                #    (EXTRACTOR, DOCUMENT → consumed by GraphMLExporter for ParadataNodeGroup)
-                if col_config.get('is_attribute', False):
-                    if col_name in row_data and not self._is_invalid_id(row_data[col_name]):
-                        prop_name = col_config.get('property_name', col_name)
-                        value = self._clean_value_for_ui(row_data[col_name])
-                        if value:
-                            setattr(strat_node, prop_name, value)
-                    continue
-
-                # 4. Regular property columns → PropertyNode (e.g., DESCRIPTION via display_name)
-                if col_name in row_data:
-                    prop_value = row_data[col_name]
-                    if not self._is_invalid_id(prop_value):
-                        # Usa display_name se disponibile
-                        prop_name = col_config.get('display_name', col_name)
-                        self._create_property(node_id, prop_name, prop_value)
+                if is_attribute:
+                    # 3. Attribute columns → store as node attribute, not PropertyNode
+                    #    (EXTRACTOR, DOCUMENT → consumed by GraphMLExporter for ParadataNodeGroup)
+                    value = self._clean_value_for_ui(value)
+                    if value:
+                        setattr(strat_node, prop_name, value)
+                else:
+                    # 4. Regular property columns → PropertyNode (e.g., DESCRIPTION via display_name)
+                    self._create_property(node_id, prop_name, value)
 
         elif 'property_columns' in self.mapping:
             # Formato legacy
@@ -399,12 +417,85 @@ class BaseImporter(ABC):
                     if not self._is_invalid_id(prop_value):
                         self._create_property(node_id, prop_name, prop_value)
 
+    def _get_property_plan(self) -> list:
+        """
+        Get the columns that _process_properties() turns into properties.
+
+        Resolves the skip rules of the new mapping format once and caches the
+        result, since it only depends on the mapping.
+
+        Returns:
+            list: (col_name, prop_name, is_attribute) tuples, in mapping order
+        """
+        if self._cached_property_plan is not None:
+            return self._cached_property_plan
+
+        id_column = self._get_id_column()
+        description_column = self._get_description_column()
+        column_maps = self.mapping.get('column_mappings', {})
+
+        # Build skip set: columns handled elsewhere
+        skip_columns = {id_column, description_column}
+
+        # 1. Relationship columns (handled in _process_stratigraphic_relations)
+        for rel in self.mapping.get('relations', []):
+            if rel.get('edge_type') in STRATIGRAPHIC_EDGE_TYPES:
+                skip_columns.add(rel['target_column'])
+
+        # 2. Epoch columns and their START/END companions (handled in _process_epochs)
+        for col_name, col_config in column_maps.items():
+            if col_config.get('node_type') == 'EpochNode':
+                skip_columns.add(col_name)
+        skip_columns.update(self._get_epoch_date_columns())
+
+        plan = []
+        for col_name, col_config in column_maps.items():
+            # Skip ID and description columns, and columns handled elsewhere
+            if col_name in skip_columns:
+                continue
+            if col_config.get('is_id', False) or col_config.get('is_description', False):
+                continue
+
+            if col_config.get('is_attribute', False):
+                plan.append((col_name, col_config.get('property_name', col_name), True))
+            else:
+                # Usa display_name se disponibile
+                plan.append((col_name, col_config.get('display_name', col_name), False))
+
+        self._cached_property_plan = plan
+        return plan
+
+    def _get_epoch_date_columns(self) -> set:
+        """
+        Get the START/END companion columns of the epoch columns.
+
+        These hold the numeric dates consumed by _process_epochs() and are
+        never turned into PropertyNodes.
+        """
+        if not self.mapping:
+            return set()
+
+        column_maps = self.mapping.get('column_mappings', {})
+        epoch_base_columns = {
+            col_name for col_name, col_config in column_maps.items()
+            if col_config.get('node_type') == 'EpochNode'
+        }
+
+        date_columns = set()
+        for col_name, col_config in column_maps.items():
+            prop_name = col_config.get('property_name', '')
+            if prop_name.endswith(('Start', 'End')):
+                base = col_name.rsplit('_', 1)[0] if '_' in col_name else col_name
+                if base in epoch_base_columns:
+                    date_columns.add(col_name)
+        return date_columns
+
     def _create_property(self, node_id: str, prop_name: str, prop_value: Any):
         """Create a property node and connect it to the parent node."""
         
         # ✅ Skip se valore non valido
         if self._is_invalid_id(prop_value):
-            logger.debug(f"Skipping property {prop_name} with invalid value: {prop_value}")
+            logger.debug("Skipping property %s with invalid value: %s", prop_name, prop_value)
             return
 
         # ✅ Clean property value per UI
@@ -418,8 +509,8 @@ class BaseImporter(ABC):
         prop_id = f"{node_id}_{prop_name}"
         existing_prop = self.graph.find_node_by_id(prop_id)
 
-        logger.debug(f"Creating property: {prop_name}")
-        logger.debug(f"Property value: {prop_value}")
+        logger.debug("Creating property: %s", prop_name)
+        logger.debug("Property value: %s", prop_value)
         
         if existing_prop:
             if self.overwrite:
@@ -522,11 +613,6 @@ class BaseImporter(ABC):
             return
 
         # Build lookup: relationship columns → edge_type (only stratigraphic)
-        STRATIGRAPHIC_EDGE_TYPES = {
-            'overlies', 'is_overlain_by', 'cuts', 'is_cut_by',
-            'fills', 'is_filled_by', 'abuts', 'is_abutted_by',
-            'is_bonded_to', 'is_physically_equal_to'
-        }
         rel_columns = {}
         for rel in relations:
             if rel.get('edge_type') in STRATIGRAPHIC_EDGE_TYPES:
@@ -567,7 +653,7 @@ class BaseImporter(ABC):
                             f"Relation {edge_type}: target '{target_id}' not found for source '{source_name}'"
                         )
 
-        logger.info(f"Stratigraphic relations: {edges_created} topological edges created")
+        logger.info("Stratigraphic relations: %d topological edges created", edges_created)
 
     def _process_epochs(self):
         """Second pass: create EpochNode objects from PERIOD/PHASE/SUBPHASE columns.
@@ -659,4 +745,5 @@ class BaseImporter(ABC):
                     except ValueError as e:
                         self.warnings.append(f"Epoch edge warning: {e}")
 
-        logger.info(f"Epochs: {epochs_created} EpochNode created, {epoch_edges_created} has_first_epoch edges")
\ No newline at end of file
+        logger.info("Epochs: %d EpochNode created, %d has_first_epoch edges",
+                    epochs_created, epoch_edges_created)
\ No newline at end of file
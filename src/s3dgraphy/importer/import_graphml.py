@@ -20,6 +20,7 @@ from ..edges.edge import Edge, EDGE_TYPES
 from ..edges import get_connections_datamodel
 from ..utils.utils import convert_shape2type, get_stratigraphic_node_class
 import re
+import sys
 import uuid
 import os
 import json
@@ -1757,11 +1758,14 @@ class GraphMLImporter:
                     nodename = self._check_if_empty(USname.text)
                 for fill_color in subnode.findall('.//{http://www.yworks.com/xml/graphml}Fill'):
                     fillcolor = fill_color.attrib['color']
+                # ✅ PERFORMANCE: forma e bordo internati: pochi valori ripetuti
+                # su migliaia di nodi, un solo oggetto str per valore e chiavi
+                # di convert_shape2type confrontate per identità
                 for border_style in subnode.findall('.//{http://www.yworks.com/xml/graphml}BorderStyle'):
-                    borderstyle = border_style.attrib['color']
-                    bordertype = border_style.attrib.get('type', 'line')
+                    borderstyle = sys.intern(border_style.attrib['color'])
+                    bordertype = sys.intern(border_style.attrib.get('type', 'line'))
                 for USshape in subnode.findall('.//{http://www.yworks.com/xml/graphml}Shape'):
-                    nodeshape = USshape.attrib['type']
+                    nodeshape = sys.intern(USshape.attrib['type'])
                 for geometry in subnode.findall('.//{http://www.yworks.com/xml/graphml}Geometry'):
                     node_y_pos = geometry.attrib['y']
 
@@ -1,20 +1,229 @@
 from .base_importer import BaseImporter
+from ._excel_common import _NA_VALUES, _resolve_sheet_name
 import pandas as pd
 from ..graph import Graph
 import os
 import json
+import logging
 from pathlib import Path
 import re
+import numpy as np
+from openpyxl import load_workbook
 
+try:
+    # Dipendenza opzionale: lettore XLSX in Rust, molto più veloce di openpyxl
+    from python_calamine import CalamineWorkbook
+    if not hasattr(CalamineWorkbook, 'close'):
+        # Versione troppo vecchia (senza close()): si usa openpyxl
+        CalamineWorkbook = None
+except ImportError:
+    CalamineWorkbook = None
 
+
+import datetime
+import functools
 import io
-import tempfile
-import shutil
-import platform
+import itertools
+import mmap
+import operator
+import traceback
 
 # ✅ PERFORMANCE: Pre-compile regex pattern for column normalization (compiled once, reused forever)
 _COLUMN_NORMALIZE_PATTERN = re.compile(r'[\s\-/\\()\[\].,;:–—]+')
 
+# ✅ PERFORMANCE: Collapse runs of underscores in one regex scan
+_UNDERSCORE_RUN_PATTERN = re.compile(r'_+')
+
+# ✅ PERFORMANCE: Rows materialized per DataFrame while streaming the sheet
+_CHUNK_SIZE = 5000
+
+# Valori accettati per "data_type" nel mapping -> conversione applicata
+_DATA_TYPE_ALIASES = {
+    'int': 'int', 'integer': 'int',
+    'float': 'float', 'number': 'float', 'numeric': 'float',
+    'date': 'date', 'datetime': 'date',
+    'str': 'string', 'string': 'string', 'text': 'string',
+}
+
+logger = logging.getLogger(__name__)
+
+
+@functools.lru_cache(maxsize=4096)
+def _normalize_column_name(col) -> str:
+    """
+    Normalize an Excel or mapping column name for matching.
+
+    Converts to an upper-case string, turns separators and punctuation into
+    underscores, collapses repeated underscores and trims them at the ends,
+    so that e.g. 'Period Start' and 'PERIOD_START' compare equal.
+
+    Results are memoized: the same mapping keys are normalized again on
+    every import.
+    """
+    # Converti prima in stringa per gestire nomi numerici
+    normalized = _COLUMN_NORMALIZE_PATTERN.sub('_', str(col).strip().upper())
+    # Rimuovi underscore multipli e quelli iniziali e finali
+    return _UNDERSCORE_RUN_PATTERN.sub('_', normalized).strip('_')
+
+
+def _normalize_column_index(columns: pd.Index) -> pd.Index:
+    """
+    Vectorized _normalize_column_name() over a whole header.
+
+    Runs the same steps with pandas string methods, in one pass per step
+    instead of one Python call per column.
+    """
+    return (columns.astype(str).str.strip().str.upper()
+            .str.replace(_COLUMN_NORMALIZE_PATTERN, '_', regex=True)
+            .str.replace(_UNDERSCORE_RUN_PATTERN, '_', regex=True)
+            .str.strip('_'))
+
+
+class _FileMap(mmap.mmap):
+    """Read-only file mapping usable as a binary file by the Excel readers."""
+
+    def seekable(self):
+        # zipfile lo richiede; mmap.mmap lo espone solo da Python 3.13
+        return True
+
+
+def _excel_engine() -> str:
+    """Return 'calamine' when python-calamine is installed, 'openpyxl' otherwise."""
+    return 'calamine' if CalamineWorkbook is not None else 'openpyxl'
+
+
+def _convert_calamine_cell(value):
+    """Map calamine cell values to what openpyxl returns for the same cell."""
+    if value == '':
+        return None
+    # calamine legge tutti i numeri come float: 476.0 -> 476
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    # Celle con sola data: calamine dà un date, openpyxl un datetime a mezzanotte
+    if isinstance(value, datetime.date) and not isinstance(value, datetime.datetime):
+        return datetime.datetime.combine(value, datetime.time())
+    return value
+
+
+def _iter_sheet_rows(source, sheet_name, start_row=0):
+    """
+    Yield the header row, then the data rows from start_row, as tuples of cell values.
+
+    Uses python-calamine when available and openpyxl in read_only mode
+    otherwise. Both yield the same values (None for empty cells), and the
+    workbook is closed when the generator is exhausted or closed.
+
+    Args:
+        source: Path or binary file object of the workbook
+        sheet_name: Sheet name or index
+        start_row: 1-based sheet row of the first data row. Rows between the
+            header and start_row (tutorial/examples) are skipped by the reader
+            without being converted to tuples.
+    """
+    # La riga 1 contiene SEMPRE le intestazioni
+    first_data_row = max(start_row, 2)
+
+    if _excel_engine() == 'calamine':
+        workbook = CalamineWorkbook.from_object(source)
+        try:
+            sheet = workbook.get_sheet_by_name(
+                _resolve_sheet_name(workbook.sheet_names, sheet_name))
+            if sheet.start is None:
+                return
+            # ✅ PERFORMANCE: iter_rows() converts one row at a time to Python
+            # objects, instead of building the whole sheet as a list of lists
+            # like to_python(). It starts from sheet row 1 but from the first
+            # non-empty column: the leading empty columns are added back so
+            # column positions match the header, as with openpyxl.
+            padding = (None,) * sheet.start[1]
+            rows = sheet.iter_rows()
+            header = next(rows, None)
+            if header is None:
+                return
+            yield padding + tuple(map(_convert_calamine_cell, header))
+            for row in itertools.islice(rows, first_data_row - 2, None):
+                yield padding + tuple(map(_convert_calamine_cell, row))
+        finally:
+            workbook.close()
+        return
+
+    # read_only: celle lette in streaming dall'XML invece di caricare tutto il foglio;
+    # keep_links=False: i collegamenti a cartelle esterne non servono all'import
+    workbook = load_workbook(source, read_only=True, data_only=True, keep_links=False)
+    try:
+        worksheet = workbook[_resolve_sheet_name(workbook.sheetnames, sheet_name)]
+        # Le dimensioni salvate nel file possono essere sbagliate
+        # (alcuni programmi le scrivono male): lasciamo leggere tutte le righe
+        worksheet.reset_dimensions()
+        header = next(worksheet.iter_rows(max_row=1, values_only=True), None)
+        if header is None:
+            return
+        yield header
+        yield from worksheet.iter_rows(min_row=first_data_row, values_only=True)
+    finally:
+        # ✅ CLEANUP: read_only workbooks keep the archive open until closed
+        workbook.close()
+
+
+def _coerce_column(values: pd.Series, data_type: str) -> pd.Series:
+    """
+    Convert a chunk column to a mapping data_type in one vectorized call.
+
+    Cells that cannot be converted become missing values.
+    """
+    if data_type == 'string':
+        return values.where(values.isna(), values.astype(str))
+    if data_type == 'date':
+        # I numeri sono seriali di Excel (giorni dal 1899-12-30): to_datetime()
+        # li leggerebbe come nanosecondi dal 1970
+        serial = values.map(type).isin((int, float)).to_numpy()
+        # Risoluzione fissa: pandas la dedurrebbe dai valori di ogni chunk
+        dates = pd.to_datetime(values.mask(serial), errors='coerce',
+                               format='mixed').astype('datetime64[us]')
+        if serial.any():
+            dates[serial] = pd.to_datetime(values[serial].astype('float64'), unit='D',
+                                           origin='1899-12-30', errors='coerce'
+                                           ).astype('datetime64[us]')
+        return dates
+    numbers = pd.to_numeric(values, errors='coerce')
+    if data_type == 'int':
+        # 2.5 in una colonna intera non è valido
+        return numbers.where(numbers % 1 == 0).astype('Int64')
+    # Sempre float64: to_numeric darebbe int64 per un chunk senza celle vuote
+    # e float64 per uno con celle vuote (-100 vs -100.0 tra un chunk e l'altro)
+    return numbers.astype('float64')
+
+
+def _row_projector(positions):
+    """
+    Return a function picking the cells at ``positions`` from a row tuple.
+
+    Rows shorter than the last position (trailing empty cells are not
+    stored in the file) are padded with None.
+    """
+    width = max(positions) + 1
+    padding = (None,) * width
+    getter = operator.itemgetter(*positions)
+    single = len(positions) == 1
+
+    def project(row):
+        if len(row) < width:
+            row = tuple(row) + padding[len(row):]
+        # itemgetter con una sola posizione restituisce il valore, non una tupla
+        return (getter(row),) if single else getter(row)
+
+    return project
+
+
+def _iter_chunks(rows, size=_CHUNK_SIZE):
+    """Yield lists of up to ``size`` rows from a row iterator."""
+    while True:
+        chunk = list(itertools.islice(rows, size))
+        if not chunk:
+            return
+        yield chunk
+
+
 class MappedXLSXImporter(BaseImporter):
     def __init__(self, filepath: str, mapping_name: str, overwrite: bool = False, 
                 existing_graph=None):
@@ -43,6 +252,9 @@ class MappedXLSXImporter(BaseImporter):
             self.graph = Graph(graph_id="temp_graph")
             self._use_existing_graph = False
             # print(f"MappedXLSXImporter: Created new unregistered graph (caller must register)")
+
+        # ✅ PERFORMANCE: Nomi del mapping normalizzati, calcolati una sola volta
+        self._normalized_column_maps = None
                 
     def parse(self) -> Graph:
         """
@@ -50,10 +262,12 @@ class MappedXLSXImporter(BaseImporter):
         Handles differences between Excel column names (with spaces) and mapping names (with underscores).
 
         OPTIMIZED: Single-pass file reading, vectorized operations, memory-efficient processing.
+        The sheet is streamed (python-calamine if installed, else openpyxl read_only)
+        and processed in chunks of rows.
         """
-        temp_file_path = None
         file_content = None
-        excel_file = None
+        file_map = None
+        rows = None
 
         try:
 
@@ -61,225 +275,129 @@ class MappedXLSXImporter(BaseImporter):
             table_settings = self.mapping.get('table_settings', {})
             start_row = table_settings.get('start_row', 0)
             sheet_name = table_settings.get('sheet_name', 0)
+
+            # ✅ PERFORMANCE: Check the mapping before opening the file, so a
+            # misconfigured mapping fails without reading the workbook
+
+            # Get column mappings
+            column_maps = self.mapping.get('column_mappings', {})
+            if not column_maps:
+                raise ValueError("No column mappings found in mapping configuration")
+
+            # Find ID column (_get_id_column() caches the lookup on the importer)
+            id_column_json = self._get_id_column()
+            if id_column_json is None:
+                raise ValueError("No ID column specified in mapping")
             
             # print(f"\n=== Starting Mapped XLSX Import ===")
             # print(f"File: {self.filepath}")
             # print(f"Sheet: {sheet_name}")
             # print(f"Start row: {start_row}")
-            # print(f"Platform: {platform.system()}")
             
-            # ✅ STRATEGIA DOPPIA: Buffer su macOS/Linux, copia temp su Windows
-            is_windows = platform.system() == "Windows"
-
-            # ✅ PERFORMANCE: Read file into memory ONCE using optimal strategy
-            if is_windows:
-                # ✅ WINDOWS: Copia il file in temp
-                # print(f"Windows detected - using temporary file copy...")
-                                
-                try:
-                    temp_dir = tempfile.gettempdir()
-                    temp_filename = f"em_mapped_{os.path.basename(self.filepath)}"
-                    temp_file_path = os.path.join(temp_dir, temp_filename)
-                    
-                    # print(f"Copying to: {temp_file_path}")
-                    
-                    # ✅ Strategia 1: Prova con mmap (accesso memoria condivisa)
-                    try:
-                        import mmap
-                        # print(f"Attempting mmap read...")
-                        
-                        with open(self.filepath, 'rb') as f:
-                            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
-                                file_bytes = mm[:]
-                        
-                        # print(f"✅ File read via mmap ({len(file_bytes)} bytes)")
-                        
-                    except (PermissionError, OSError, ValueError) as mmap_error:
-                        # print(f"mmap failed: {mmap_error}, trying pathlib...")
-                        
-                        # ✅ Strategia 2: Prova con pathlib (lettura diretta veloce)
-                        try:
-                            from pathlib import Path
-                            file_bytes = Path(self.filepath).read_bytes()
-                            # print(f"✅ File read via pathlib ({len(file_bytes)} bytes)")
-                            
-                        except PermissionError as path_error:
-                            # print(f"pathlib failed: {path_error}, trying buffering=0...")
-                            
-                            # ✅ Strategia 3: Prova con buffering disabilitato
-                            try:
-                                with open(self.filepath, 'rb', buffering=0) as f:
-                                    file_bytes = f.read()
-                                # print(f"✅ File read with buffering=0 ({len(file_bytes)} bytes)")
-                                
-                            except PermissionError as buffer_error:
-                                # ✅ Strategia 4: Ultimo tentativo - retry con sleep
-                                # print(f"All methods failed, trying retry with delay...")
-                                
-                                import time
-                                last_error = None
-                                for attempt in range(3):
-                                    try:
-                                        time.sleep(0.5)
-                                        with open(self.filepath, 'rb') as f:
-                                            file_bytes = f.read()
-                                        # print(f"✅ File read on retry attempt {attempt + 1}")
-                                        break
-                                    except PermissionError as e:
-                                        last_error = e
-                                        if attempt < 2:
-                                            pass
-                                            # print(f"Retry {attempt + 1}/3 failed, waiting...")
-                                else:
-                                    raise ImportError(
-                                        f"⚠️ CANNOT ACCESS FILE ⚠️\n\n"
-                                        f"The file appears to be locked by Excel or another application.\n\n"
-                                        f"Solutions:\n"
-                                        f"1. Close Excel and try again\n"
-                                        f"2. Save a copy of the file and import that\n"
-                                        f"3. Use 'File > Save As' in Excel to create a new version\n\n"
-                                        f"File: {os.path.basename(self.filepath)}\n"
-                                        f"Location: {os.path.dirname(self.filepath)}\n\n"
-                                        f"Technical error: {str(last_error)}"
-                                    )
-
-                    # Write to temp file
-                    with open(temp_file_path, 'wb') as f:
-                        f.write(file_bytes)
-                    
-                    # print(f"✅ Temporary file created successfully")
-                    working_path = temp_file_path
-
-                except Exception as e:
-                    raise ImportError(f"Error accessing file: {str(e)}")
-
-            else:
-                # ✅ macOS/Linux: Usa buffer in memoria
-                # print(f"macOS/Linux detected - using memory buffer...")
-                
+            # ✅ PERFORMANCE: Same strategy on every platform: the file is mapped
+            # read-only and pages are loaded on demand while the reader parses
+            # it, instead of a blocking read of the whole file up front.
+            # Se mmap non è possibile (file bloccato da Excel, file vuoto)
+            # il file viene letto in memoria con qualche tentativo.
+            try:
+                # ✅ PERFORMANCE: mmap the file and hand the mapping itself to
+                # the reader (it is readable and seekable), without copying
+                # the bytes into a buffer first
                 try:
+                    # print(f"Attempting mmap read...")
+
                     with open(self.filepath, 'rb') as f:
-                        file_content = io.BytesIO(f.read())
-                    # print(f"✅ File loaded in memory ({len(file_content.getvalue())} bytes)")
+                        file_map = _FileMap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                    working_path = file_map
+                    # print(f"✅ File mapped via mmap ({len(file_map)} bytes)")
+
+                except (PermissionError, OSError, ValueError) as mmap_error:
+                    # print(f"mmap failed: {mmap_error}, reading into memory...")
+
+                    # ✅ Fallback: lettura in memoria, con retry se il file è bloccato da Excel
+                    import time
+                    last_error = None
+                    for attempt in range(3):
+                        try:
+                            file_content = io.BytesIO(Path(self.filepath).read_bytes())
+                            # print(f"✅ File read on attempt {attempt + 1}")
+                            break
+                        except PermissionError as e:
+                            last_error = e
+                            # print(f"Attempt {attempt + 1}/3 failed, waiting...")
+                            time.sleep(0.5)
+                    else:
+                        raise ImportError(
+                            f"⚠️ CANNOT ACCESS FILE ⚠️\n\n"
+                            f"The file appears to be locked by Excel or another application.\n\n"
+                            f"Solutions:\n"
+                            f"1. Close Excel and try again\n"
+                            f"2. Save a copy of the file and import that\n"
+                            f"3. Use 'File > Save As' in Excel to create a new version\n\n"
+                            f"File: {os.path.basename(self.filepath)}\n"
+                            f"Location: {os.path.dirname(self.filepath)}\n\n"
+                            f"Technical error: {str(last_error)}"
+                        )
                     working_path = file_content
-                except Exception as e:
-                    raise ImportError(f"Error reading file: {str(e)}")
-            
-            # Read Excel file
-            # IMPORTANTE: header=0 dice a pandas che le intestazioni sono alla riga 0
-            # Poi usiamo iloc per prendere solo i dati dalla riga start_row in poi
-            df_full = pd.read_excel(
-                working_path,  # ✅ Usa working_path invece di self.filepath
-                sheet_name=sheet_name,
-                header=0,  # Le intestazioni sono SEMPRE alla prima riga (indice 0)
-                na_values=['', 'NA', 'N/A'],
-                keep_default_na=True,
-                engine='openpyxl'
-            )
-            
-            # print(f"Full DataFrame shape: {df_full.shape}")
-            # print(f"Column names found: {list(df_full.columns)[:10]}")
-            
-            # Se start_row è specificato, prendi solo i dati da quella riga in poi
-            # (escludendo righe tutorial o esempi)
-            if start_row > 1:
-                # Sottrai 1 perché l'indice di pandas parte da 0, ma start_row conta da 1
-                # E sottrai ancora 1 perché la riga 0 è già stata usata per le intestazioni
-                actual_start_idx = start_row - 2
-                df = df_full.iloc[actual_start_idx:].reset_index(drop=True)
-                # print(f"Skipping first {actual_start_idx} data rows (tutorial/examples)")
-                # print(f"Data DataFrame shape after skipping: {df.shape}")
-            else:
-                df = df_full
-            
-            # print(f"First data row sample: {df.iloc[0].to_dict() if not df.empty else 'No data'}")
-            
-            if df.empty:
+
+            except Exception as e:
+                raise ImportError(f"Error accessing file: {str(e)}")
+
+            # ✅ PERFORMANCE: Stream the sheet instead of pd.read_excel().
+            # Rows are turned into Python tuples lazily (calamine iter_rows()
+            # when installed, openpyxl read_only otherwise), so only one chunk
+            # of _CHUNK_SIZE rows is materialized as a DataFrame at a time.
+            # openpyxl streams the sheet XML; calamine keeps the parsed cells
+            # of the sheet in its compact native form, not as Python objects.
+            # Se start_row è specificato, le righe tutorial o esempi prima di
+            # start_row vengono saltate direttamente dal lettore
+            rows = _iter_sheet_rows(working_path, sheet_name, start_row)
+
+            # Le intestazioni sono SEMPRE alla prima riga
+            header = next(rows, None)
+            if header is None:
                 raise ValueError("Excel file is empty")
+
+            # ✅ NORMALIZZAZIONE: Crea dizionario per mappare nomi Excel -> posizione colonna
+            # Converte spazi in underscore e tutto in maiuscolo per matching case-insensitive.
+            # Con intestazioni duplicate vince la prima colonna.
+            header_index = pd.Index(header, dtype=object)
+            normalized_index = _normalize_column_index(header_index)
+            keep = header_index.notna() & ~normalized_index.duplicated()
+            excel_columns_normalized = dict(zip(normalized_index[keep], np.flatnonzero(keep).tolist()))
+            logger.debug("Normalized %d Excel columns: %s",
+                         len(excel_columns_normalized), excel_columns_normalized)
             
-            # Get column mappings
-            column_maps = self.mapping.get('column_mappings', {})
-            if not column_maps:
-                raise ValueError("No column mappings found in mapping configuration")
-            
-            # ✅ NORMALIZZAZIONE: Crea dizionario per mappare nomi Excel -> nomi JSON
-            # Converte spazi in underscore e tutto in maiuscolo per matching case-insensitive
-            excel_columns_normalized = {}
-            # print(f"\n=== Normalizing Excel columns ===")
-            # print(f"Raw Excel columns: {list(df.columns)}")
-            
-            for excel_col in df.columns:
-                # Converti prima in stringa per gestire nomi numerici
-                excel_col_str = str(excel_col).strip()
-                # Normalizza: sostituisci vari caratteri con underscore
-                normalized = excel_col_str.upper()
-                # Sostituisci spazi, trattini e altri caratteri speciali
-                for char in [' ', '-', '/', '\\', '(', ')', '[', ']', '.', ',', ':', ';', '–', '—']:
-                    normalized = normalized.replace(char, '_')
-                # Rimuovi underscore multipli
-                while '__' in normalized:
-                    normalized = normalized.replace('__', '_')
-                # Rimuovi underscore iniziali e finali
-                normalized = normalized.strip('_')
-                
-                excel_columns_normalized[normalized] = excel_col
-                # print(f"  Excel: '{excel_col_str}' -> Normalized: '{normalized}'")
-            
-            # Crea mapping inverso per JSON -> Excel column names
+            # Crea mapping inverso per JSON -> Excel column positions
             json_to_excel_mapping = {}
             unmapped_json_cols = []
             
             # print(f"\n=== Matching JSON mappings to Excel columns ===")
             # print(f"JSON mapping columns: {list(column_maps.keys())}")
             
-            for json_col in column_maps.keys():
-                # Converti in stringa e normalizza nome JSON allo stesso modo
-                json_col_str = str(json_col).strip()
-                json_normalized = json_col_str.upper()
-                # Applica la stessa normalizzazione
-                for char in [' ', '-', '/', '\\', '(', ')', '[', ']', '.', ',', ':', ';', '–', '—']:
-                    json_normalized = json_normalized.replace(char, '_')
-                # Rimuovi underscore multipli
-                while '__' in json_normalized:
-                    json_normalized = json_normalized.replace('__', '_')
-                # Rimuovi underscore iniziali e finali
-                json_normalized = json_normalized.strip('_')
-                
-                # print(f"  JSON '{json_col}' -> Normalized: '{json_normalized}'")
-                
+            # Nomi JSON normalizzati allo stesso modo (in cache sull'importer)
+            for json_col, json_normalized in self._get_normalized_column_maps():
                 if json_normalized in excel_columns_normalized:
                     # Trovata corrispondenza!
-                    actual_excel_col = excel_columns_normalized[json_normalized]
-                    json_to_excel_mapping[json_col] = actual_excel_col
-                    # print(f"    ✓ MATCHED to Excel column: '{actual_excel_col}'")
+                    json_to_excel_mapping[json_col] = excel_columns_normalized[json_normalized]
+                    # print(f"    ✓ MATCHED to Excel column: '{header[json_to_excel_mapping[json_col]]}'")
                 else:
                     # Nessuna corrispondenza trovata
                     unmapped_json_cols.append(json_col)
                     # print(f"    ✗ NO MATCH FOUND in Excel")
-                
-                
-                if json_normalized in excel_columns_normalized:
-                    # Match found
-                    actual_excel_col = excel_columns_normalized[json_normalized]
-                    json_to_excel_mapping[json_col] = actual_excel_col
-                    if len(json_to_excel_mapping) <= 10:  # Mostra solo i primi 10 match
-                        pass
-                        # print(f"  ✓ Matched: '{json_col}' -> '{actual_excel_col}'")
-                else:
-                    # No match
-                    unmapped_json_cols.append(json_col)
             
             # Log risultati del matching
             # print(f"\n=== Column Matching Results ===")
-            # print(f"Excel columns (original): {[str(c) for c in df.columns]}")
+            # print(f"Excel columns (original): {[str(c) for c in header]}")
             # print(f"Mapping columns (JSON): {list(column_maps.keys())}")
             # print(f"\nSuccessfully matched: {len(json_to_excel_mapping)} columns")
             
             if unmapped_json_cols:
                 # print(f"\n⚠️ WARNING: {len(unmapped_json_cols)} columns from mapping NOT found in Excel:")
-                for col in unmapped_json_cols:
-                    # print(f"  - {col}")
-                    self.warnings.append(f"Column '{col}' not found in Excel (after normalization)")
+                self.warnings.extend(
+                    f"Column '{col}' not found in Excel (after normalization)"
+                    for col in unmapped_json_cols
+                )
 
             if not json_to_excel_mapping:
                 # print("\n❌ ERROR: No columns could be matched!")
@@ -289,68 +407,110 @@ class MappedXLSXImporter(BaseImporter):
                     json_normalized = str(json_col).strip().upper().replace(' ', '_').replace('-', '_')
                     # print(f"  - {json_normalized} (original: {json_col})")
                 # print("\nActual columns in Excel (after normalization):")
-                for norm, orig in excel_columns_normalized.items():
+                for norm, position in excel_columns_normalized.items():
                     pass
-                    # print(f"  - {norm} (original: {orig})")
+                    # print(f"  - {norm} (original: {header[position]})")
                 raise ValueError("No columns could be matched between mapping and Excel file!")
 
-            # Find ID column
-            id_column_json = None
-            id_column_excel = None
-            for col_name, col_config in column_maps.items():
-                if col_config.get('is_id', False):
-                    id_column_json = col_name
-                    id_column_excel = json_to_excel_mapping.get(col_name)
-                    break
+            # ID column resolved from the header, before any data row is read
+            id_column_excel = json_to_excel_mapping.get(id_column_json)
 
-            if not id_column_excel:
+            if id_column_excel is None:
                 raise ValueError(f"ID column not found in Excel after normalization")
             
-            # print(f"\nUsing ID column: '{id_column_json}' (JSON) -> '{id_column_excel}' (Excel)")
+            # print(f"\nUsing ID column: '{id_column_json}' (JSON) -> column {id_column_excel} (Excel)")
             
             # Process rows
             total_rows = 0
+            rows_read = 0
             successful_rows = 0
             skipped_rows = 0
             error_rows = 0
 
+            excel_positions = list(json_to_excel_mapping.values())
+            json_columns = list(json_to_excel_mapping.keys())
+
+            # ✅ PERFORMANCE: Typed columns are converted once per chunk instead
+            # of per cell later on. Epoch START/END dates are numbers; any other
+            # column can declare a "data_type" in the mapping.
+            column_types = {
+                col: 'float' for col in self._get_epoch_date_columns().intersection(json_columns)
+            }
+            for json_col in json_columns:
+                data_type = _DATA_TYPE_ALIASES.get(
+                    str(column_maps[json_col].get('data_type', '')).strip().lower())
+                if data_type:
+                    column_types[json_col] = data_type
+            # Celle non convertibili (es. "circa 200 BC" in una data di epoca):
+            # contate per colonna e segnalate nei warning
+            invalid_cells = dict.fromkeys(column_types, 0)
+
             # Store rows for second-pass processing (epochs, relations)
             self._stored_rows = []
 
-            for idx, row in df.iterrows():
-                total_rows += 1
+            # ✅ PERFORMANCE: The sample row is only formatted when debug logging is on
+            debug_first_row = logger.isEnabledFor(logging.DEBUG)
 
-                try:
-                    # Build row_dict using JSON column names as keys
-                    # but values from Excel columns
-                    row_dict = {}
+            # ✅ PERFORMANCE: Only the mapped cells of each row are copied into
+            # the chunk DataFrame; unmapped columns are never materialized
+            project_row = _row_projector(excel_positions)
 
-                    for json_col, excel_col in json_to_excel_mapping.items():
-                        value = row[excel_col]
+            for chunk_rows in _iter_chunks(rows, _CHUNK_SIZE):
+                # dtype=object keeps cell values as the reader returns them,
+                # so the result does not depend on how rows fall into chunks
+                chunk = pd.DataFrame(list(map(project_row, chunk_rows)),
+                                     columns=json_columns, dtype=object)
+                del chunk_rows
 
-                        # Only add non-null values
-                        if pd.notna(value):
-                            row_dict[json_col] = value
+                # Empty rows at the end of the sheet are not counted
+                filled = np.flatnonzero(chunk.notna().to_numpy().any(axis=1))
+                if filled.size:
+                    total_rows = rows_read + int(filled[-1]) + 1
+                rows_read += len(chunk)
 
-                    # Skip rows without data
-                    if not row_dict or id_column_json not in row_dict:
-                        skipped_rows += 1
-                        continue
+                # ✅ PERFORMANCE: Drop rows without an ID in one vectorized pass
+                # instead of discovering them row by row. The ID column is part
+                # of the mapping, so this also removes fully empty rows.
+                # Whitespace-only IDs look empty in Excel and are skipped too,
+                # rather than failing later inside process_row().
+                id_values = chunk[id_column_json]
+                id_mask = (id_values.notna() & ~id_values.isin(_NA_VALUES)
+                           & id_values.astype(str).str.strip().ne('')).to_numpy()
+                records_df = chunk.loc[id_mask]
+                # NA tokens in the remaining cells become NaN, like pd.read_excel()
+                records_df = records_df.mask(records_df.isin(_NA_VALUES))
 
-                    # Process the row (first pass: create nodes + properties)
-                    result_node = self.process_row(row_dict)
+                # ✅ PERFORMANCE: Convert typed columns once per column instead of
+                # per cell (e.g. float() in _process_epochs()). Cells that do not
+                # convert become missing and are dropped below, rather than
+                # aborting the second pass with a ValueError; they are counted
+                # and reported in the import warnings.
+                for json_col, data_type in column_types.items():
+                    values = records_df[json_col]
+                    converted = _coerce_column(values, data_type)
+                    invalid_cells[json_col] += int((values.notna() & converted.isna()).sum())
+                    records_df[json_col] = converted
 
-                    if result_node is not None:
-                        successful_rows += 1
-                        # Store row for second-pass processing
-                        self._stored_rows.append(row_dict)
-                    else:
-                        skipped_rows += 1
+                if debug_first_row and not records_df.empty:
+                    logger.debug("First data row sample: %s", records_df.iloc[0].to_dict())
+                    debug_first_row = False
+
+                # ✅ PERFORMANCE: Null checks run once per chunk as a vectorized
+                # notna() mask; the row loop only zips plain Python lists.
+                # Only non-null values are kept (this also covers pd.NA/NaT).
+                cell_values = records_df.to_numpy(dtype=object).tolist()
+                cell_present = records_df.notna().to_numpy().tolist()
+                successful, _, errors = self.process_rows(
+                    {k: v for k, v, present in zip(json_columns, values, row_present) if present}
+                    for values, row_present in zip(cell_values, cell_present)
+                )
+                successful_rows += successful
+                error_rows += errors
 
-                except Exception as e:
-                    error_rows += 1
-                    error_msg = f"Error processing row: {str(e)}"
-                    self.warnings.append(error_msg)
+            if total_rows == 0:
+                raise ValueError("Excel file is empty")
+
+            skipped_rows = total_rows - successful_rows - error_rows
 
             # Second pass: create EpochNodes and stratigraphic relation edges
             # These require all nodes to exist first (two-pass approach)
@@ -366,12 +526,21 @@ class MappedXLSXImporter(BaseImporter):
             # print(f"Columns matched: {len(json_to_excel_mapping)}/{len(column_maps)}")
             
             # Add to warnings for UI
-            self.warnings.append(f"\nImport summary:")
-            self.warnings.append(f"Rows: {successful_rows}/{total_rows} successful")
-            self.warnings.append(f"Columns: {len(json_to_excel_mapping)}/{len(column_maps)} matched")
+            summary = [
+                f"\nImport summary:",
+                f"Rows: {successful_rows}/{total_rows} successful",
+                f"Columns: {len(json_to_excel_mapping)}/{len(column_maps)} matched",
+            ]
 
             if unmapped_json_cols:
-                self.warnings.append(f"Unmatched columns: {', '.join(unmapped_json_cols[:5])}")
+                summary.append(f"Unmatched columns: {', '.join(unmapped_json_cols[:5])}")
+
+            summary.extend(
+                f"Column '{json_col}': {count} value(s) are not a valid "
+                f"{column_types[json_col]} and were ignored"
+                for json_col, count in invalid_cells.items() if count
+            )
+            self.warnings.extend(summary)
 
             if self.warnings:
                 self.display_warnings()
@@ -394,11 +563,15 @@ class MappedXLSXImporter(BaseImporter):
             error_msg = f"Unexpected error: {str(e)}"
             self.warnings.append(error_msg)
             # print(f"\n❌ {error_msg}")
-            import traceback
             traceback.print_exc()
             raise
         
         finally:
+            # ✅ CLEANUP: Close the workbook if parsing stopped before the last row
+            # (before releasing the buffer it reads from)
+            if rows is not None:
+                rows.close()
+
             # ✅ CLEANUP: Close resources and release memory
             if file_content is not None:
                 try:
@@ -407,18 +580,29 @@ class MappedXLSXImporter(BaseImporter):
                 except:
                     pass
 
-            # ✅ CLEANUP: Remove temporary file on Windows
-            if temp_file_path and os.path.exists(temp_file_path):
+            if file_map is not None:
                 try:
-                    os.remove(temp_file_path)
-                    # print(f"Temporary file removed: {temp_file_path}")
-                except Exception as e:
+                    file_map.close()
+                    # print("File mapping closed")
+                except:
                     pass
-                    # print(f"Warning: Could not remove temp file: {e}")
-            
-            # Garbage collection
-            import gc
-            gc.collect()
+
+    def _get_normalized_column_maps(self) -> list:
+        """
+        Get the mapping column names with their normalized form.
+
+        Computed once per importer, since the mapping does not change
+        between parse() calls.
+
+        Returns:
+            list: (json_col, normalized name) pairs, in mapping order
+        """
+        if self._normalized_column_maps is None:
+            self._normalized_column_maps = [
+                (json_col, _normalize_column_name(json_col))
+                for json_col in self.mapping.get('column_mappings', {})
+            ]
+        return self._normalized_column_maps
 
     def validate_mapping(self):
 
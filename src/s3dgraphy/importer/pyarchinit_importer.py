@@ -3,7 +3,10 @@
 from typing import Dict, Any, Optional
 from .base_importer import BaseImporter
 import sqlite3
+import gc
 import os
+import random
+import logging
 from ..graph import Graph  
 from ..nodes.base_node import Node
 from ..nodes.property_node import PropertyNode
@@ -11,6 +14,32 @@ from ..nodes.stratigraphic_node import StratigraphicNode
 from ..utils.utils import get_stratigraphic_node_class
 from ..multigraph.multigraph import multi_graph_manager  
 
+logger = logging.getLogger(__name__)
+
+# ✅ PERFORMANCE: PRNG seeded once from os.urandom; node IDs only need to be
+# unique within the session, not cryptographically unpredictable
+_uuid_rng = random.Random(os.urandom(16))
+
+if hasattr(os, 'register_at_fork'):
+    # Un processo figlio (fork) eredita lo stato del PRNG: senza un nuovo seme
+    # genererebbe gli stessi UUID del padre
+    os.register_at_fork(after_in_child=lambda: _uuid_rng.seed(os.urandom(16)))
+
+
+def _fast_uuid() -> str:
+    """Return a random RFC 4122 version-4 UUID string (same format as str(uuid.uuid4()))."""
+    n = _uuid_rng.getrandbits(128)
+    # Imposta versione (4) e variante (RFC 4122) come uuid.UUID(version=4)
+    n = (n & ~(0xc000 << 48)) | (0x8000 << 48)
+    n = (n & ~(0xf000 << 64)) | (4 << 76)
+    h = '%032x' % n
+    return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
+
+
+def _quote_identifier(name: str) -> str:
+    """Quote an SQLite table or column name taken from the mapping or the database."""
+    return '"{}"'.format(name.replace('"', '""'))
+
 class PyArchInitImporter(BaseImporter):
     def __init__(self, filepath: str, mapping_name: str, overwrite: bool = False,
                 existing_graph=None):
@@ -37,13 +66,13 @@ class PyArchInitImporter(BaseImporter):
             self.graph = existing_graph
             self.graph_id = existing_graph.graph_id
             self._use_existing_graph = True
-            # print(f"PyArchInitImporter: Using provided graph '{self.graph_id}'")
+            logger.debug("PyArchInitImporter: Using provided graph '%s'", self.graph_id)
         else:
             # Create new UNREGISTERED graph (3DGIS mode)
             # Caller must set proper graph_id and register it
             self.graph = Graph(graph_id="temp_graph")
             self._use_existing_graph = False
-            # print(f"PyArchInitImporter: Created new unregistered graph (caller must register)")
+            logger.debug("PyArchInitImporter: Created new unregistered graph (caller must register)")
 
         # Structured list of rows whose stratigraphic node name could
         # not be matched in the host graph (only meaningful in
@@ -52,35 +81,49 @@ class PyArchInitImporter(BaseImporter):
         # Hybrid-C adapter maps it to graph.attributes['aux_orphans'].
         self.orphans = []
 
+        # name -> node index, valid only while parse() runs (see _find_node_by_name)
+        self._name_index = None
+
         self.validate_mapping()
 
+        # ✅ PERFORMANCE: metadati del mapping calcolati una sola volta,
+        # non ad ogni riga del database
+        self._id_column = self._get_id_column()
+        self._desc_column = self._get_description_column()
+        # (colonna, nome proprietà, suffisso "_<nome>" dell'ID del PropertyNode)
+        self._property_cols = tuple(
+            (col_name, col_config['property_name'], f"_{col_config['property_name']}")
+            for col_name, col_config in self.mapping.get('column_mappings', {}).items()
+            if not col_config.get('is_id', False)
+            and not col_config.get('is_description', False)
+            and col_config.get('property_name')
+        )
+
     def process_row(self, row_dict: Dict[str, Any]) -> Optional[Node]:
         """Process a row from pyArchInit database"""
         try:
             # 1️⃣ Get ID column and convert if numeric
-            id_column = self._get_id_column()
+            id_column = self._id_column
             if isinstance(row_dict.get(id_column), (int, float)):
                 row_dict[id_column] = str(row_dict[id_column])
                 
             node_name = str(row_dict[id_column])  # Es: "1001"
             
-            # print(f"\n=== Processing pyArchInit row ===")
-            # print(f"Node name from DB: {node_name}")
+            logger.debug("Processing pyArchInit row: %s", node_name)
             
             # 2️⃣ Check if we're enriching existing graph
             is_enriching_existing = self._use_existing_graph and len(self.graph.nodes) > 0
-            # print(f"Enriching existing graph: {is_enriching_existing}")
             
             # 3️⃣ Try to find existing node by NAME (not ID!)
             existing_node = self._find_node_by_name(node_name)
             
             if existing_node:
                 # ✅ Node found in existing graph: only add properties
-                # print(f"✓ Found existing node: {existing_node.name} (ID: {existing_node.node_id})")
-                # print(f"  → Adding properties to existing node")
+                logger.debug("Found existing node %s (ID: %s), adding properties",
+                             existing_node.name, existing_node.node_id)
                 
                 # Get description from mapping
-                desc_column = self._get_description_column()
+                desc_column = self._desc_column
                 description = row_dict.get(desc_column) if desc_column else None
                 
                 # Update description if overwrite is enabled
@@ -109,10 +152,9 @@ class PyArchInitImporter(BaseImporter):
                 
             else:
                 # ✅ Creating new graph → create new stratigraphic node
-                # print(f"✓ Creating new stratigraphic node: {node_name}")
                 
                 # Get description from mapping
-                desc_column = self._get_description_column()
+                desc_column = self._desc_column
                 description = row_dict.get(desc_column) if desc_column else "pyarchinit element"
                 
                 # Get node type from id column mapping
@@ -121,15 +163,16 @@ class PyArchInitImporter(BaseImporter):
                 node_class = get_stratigraphic_node_class(strat_type)
                 
                 # Create new node with UUID
-                import uuid
                 new_node = node_class(
-                    node_id=str(uuid.uuid4()),
+                    node_id=_fast_uuid(),
                     name=node_name,
                     description=str(description)
                 )
                 
                 self.graph.add_node(new_node)
-                # print(f"  → Node created with ID: {new_node.node_id}")
+                if self._name_index is not None:
+                    self._name_index.setdefault(node_name, new_node)
+                logger.debug("Created stratigraphic node %s with ID %s", node_name, new_node.node_id)
 
                 # Process properties for new node
                 self._process_pyarchinit_properties(row_dict, new_node)
@@ -144,54 +187,96 @@ class PyArchInitImporter(BaseImporter):
         Process property columns for a stratigraphic node.
         Only creates properties if they have non-empty values.
         """
-        # print(f"\n  Processing properties for node: {strat_node.name}")
-        
-        for col_name, col_config in self.mapping.get('column_mappings', {}).items():
-            # Skip ID and description columns
-            if col_config.get('is_id', False) or col_config.get('is_description', False):
-                continue
-                
-            if col_config.get('property_name'):
-                value = row_dict.get(col_name, '')
-                
-                # ✅ IMPORTANTE: Crea proprietà SOLO se valore esiste e non è vuoto
-                if value and str(value).strip():
-                    property_id = f"{strat_node.node_id}_{col_config['property_name']}"
-                    
-                    # Check if property already exists
-                    existing_prop = self.graph.find_node_by_id(property_id)
-                    
-                    if existing_prop:
-                        # Update existing property if overwrite enabled
-                        if self.overwrite:
-                            existing_prop.value = str(value)
-                            existing_prop.description = str(value)
-                            # print(f"    ↻ Updated property: {col_config['property_name']} = '{value}'")
-                    else:
-                        # Create new property node
-                        property_node = PropertyNode(
-                            node_id=property_id,
-                            name=col_config['property_name'],
-                            description=str(value),
-                            value=str(value),
-                            property_type=col_config['property_name']
-                        )
-                        self.graph.add_node(property_node)
-                        # print(f"    + Created property: {col_config['property_name']} = '{value}'")
-
-                        # Create edge between stratigraphic node and property
-                        edge_id = f"{strat_node.node_id}_has_property_{property_id}"
-                        if not self.graph.find_edge_by_id(edge_id):
-                            self.graph.add_edge(
-                                edge_id=edge_id,
-                                edge_source=strat_node.node_id,
-                                edge_target=property_id,
-                                edge_type="has_property"
-                            )
+        # ✅ PERFORMANCE: livello di log verificato una volta per riga,
+        # non per ogni proprietà
+        debug = logger.isEnabledFor(logging.DEBUG)
+
+        # ✅ PERFORMANCE: nodi e archi nuovi raccolti per la riga e inseriti
+        # nel grafo con una sola chiamata bulk
+        new_nodes = {}
+        new_edges = []
+
+        # ✅ PERFORMANCE: il mapping è fisso per tutto l'import: metodi e
+        # attributi usati nel ciclo sono risolti una volta sola come locali
+        graph = self.graph
+        find_node_by_id = graph.find_node_by_id
+        has_edge = graph.has_edge
+        get_value = row_dict.get
+        overwrite = self.overwrite
+        strat_id = strat_node.node_id
+
+        for col_name, property_name, id_suffix in self._property_cols:
+            value = get_value(col_name, '')
+            # ✅ PERFORMANCE: stringa calcolata una sola volta per cella;
+            # isspace() controlla gli spazi senza allocare come strip()
+            str_value = (value if type(value) is str else str(value)) if value else ''
+
+            # ✅ IMPORTANTE: Crea proprietà SOLO se valore esiste e non è vuoto
+            if str_value and not str_value.isspace():
+                property_id = strat_id + id_suffix
+
+                # Check if property already exists
+                existing_prop = new_nodes.get(property_id) or find_node_by_id(property_id)
+
+                if existing_prop:
+                    # Update existing property if overwrite enabled
+                    if overwrite:
+                        existing_prop.value = str_value
+                        existing_prop.description = str_value
+                        if debug:
+                            logger.debug("Updated property %s = %r", property_name, value)
                 else:
-                    pass
-                    # Valore vuoto o mancante - non creare proprietà
-                    # print(f"    ⊘ Skipped property: {col_config['property_name']} (empty value)")
+                    # Create new property node
+                    property_node = PropertyNode(
+                        node_id=property_id,
+                        name=property_name,
+                        description=str_value,
+                        value=str_value,
+                        property_type=property_name
+                    )
+                    new_nodes[property_id] = property_node
+                    if debug:
+                        logger.debug("Created property %s = %r", property_name, value)
+
+                    # Create edge between stratigraphic node and property
+                    # ✅ PERFORMANCE: edge ID costruito solo se l'arco manca
+                    if not has_edge(strat_id, property_id, "has_property"):
+                        edge_id = f"{strat_id}_has_property_{property_id}"
+                        new_edges.append(
+                            (edge_id, strat_id, property_id, "has_property")
+                        )
+            elif debug:
+                # Valore vuoto o mancante - non creare proprietà
+                logger.debug("Skipped property %s (empty value)", property_name)
+
+        if new_nodes:
+            added = graph.add_nodes_bulk(new_nodes.values())
+            if self._name_index is not None:
+                for node in added:
+                    self._name_index.setdefault(node.name, node)
+            graph.add_edges_bulk(new_edges)
+
+    def _build_name_index(self) -> Dict[str, Node]:
+        """
+        Map node names (and attributes['original_name']) to nodes.
+
+        setdefault keeps the first node in graph order, so lookups return the
+        same node as the linear scan in BaseImporter._find_node_by_name.
+        """
+        name_index = {}
+        for node in self.graph.nodes:
+            name_index.setdefault(node.name, node)
+            original_name = getattr(node, 'attributes', {}).get('original_name')
+            if original_name is not None:
+                name_index.setdefault(original_name, node)
+        return name_index
+
+    def _find_node_by_name(self, target_name: str):
+        """Find a node by name, in O(1) while parse() holds the name index."""
+        # ✅ PERFORMANCE: dict lookup invece di una scansione del grafo per riga
+        if self._name_index is None:
+            return super()._find_node_by_name(target_name)
+        return self._name_index.get(target_name)
 
     def _get_description_column(self) -> Optional[str]:
         """Get description column from mapping"""
@@ -200,19 +285,41 @@ class PyArchInitImporter(BaseImporter):
                 return col_name
         return None
 
+    def _build_select(self, cursor, table_name: str) -> str:
+        """
+        Build a SELECT restricted to the table columns named in the mapping.
+
+        Falls back to SELECT * when the table columns cannot be listed or none
+        of them is mapped, so the usual sqlite error surfaces unchanged.
+        """
+        column_maps = self.mapping.get('column_mappings', {})
+        table_columns = [row[0] for row in cursor.execute(
+            "SELECT name FROM pragma_table_info(?)", (table_name,))]
+        needed_cols = [col for col in table_columns if col in column_maps]
+        if not needed_cols:
+            return f"SELECT * FROM {_quote_identifier(table_name)}"
+
+        quoted = ', '.join(map(_quote_identifier, needed_cols))
+        return f"SELECT {quoted} FROM {_quote_identifier(table_name)}"
+
     def parse(self) -> Graph:
         """Parse pyArchInit database using mapping configuration"""
+        # ✅ PERFORMANCE: GC ciclico sospeso durante l'import: le righe creano
+        # solo nodi/archi senza cicli, e le passate complete su un grafo che
+        # cresce sono puro overhead. Lo stato precedente viene ripristinato.
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
         try:
-            # print("\n=== Starting PyArchInit Import ===")
+            logger.debug("Starting PyArchInit import from %s", self.filepath)
             conn = sqlite3.connect(self.filepath)
+            # ✅ PERFORMANCE: pragma di sola lettura, validi solo per questa
+            # connessione. Niente journal_mode=WAL: modificherebbe in modo
+            # permanente il database pyArchInit dell'utente.
+            conn.execute("PRAGMA cache_size=-65536")
+            conn.execute("PRAGMA mmap_size=268435456")
+            conn.execute("PRAGMA temp_store=MEMORY")
             cursor = conn.cursor()
             
-            # Debug del mapping
-            # print(f"\nMapping configuration:")
-            # print(f"Filepath: {self.filepath}")
-            # print(f"Table settings: {self.mapping.get('table_settings', {})}")
-            # print(f"Column mappings: {self.mapping.get('column_mappings', {})}")
-            
             # Get table name from mapping
             table_settings = self.mapping.get('table_settings', {})
             table_name = table_settings.get('table_name')
@@ -220,56 +327,63 @@ class PyArchInitImporter(BaseImporter):
             if not table_name:
                 raise ValueError("Table name not specified in mapping configuration")
             
-            # print(f"\nReading from table: {table_name}")
+            logger.debug("Reading from table: %s", table_name)
+
+            self._name_index = self._build_name_index()
             
             # Query all rows from table
-            cursor.execute(f"SELECT * FROM {table_name}")
-            columns = [description[0] for description in cursor.description]
-            # print(f"Columns found: {columns}")
-            
-            rows = cursor.fetchall()
-            # print(f"Total rows to process: {len(rows)}")
-            
+            cursor.execute(f"SELECT * FROM {_quote_identifier(table_name)}" if self._use_existing_graph
+                           else self._build_select(cursor, table_name))
+            # ✅ PERFORMANCE: tuple dei nomi colonna calcolata una sola volta
+            columns = tuple(description[0] for description in cursor.description)
+            logger.debug("Columns found: %s", columns)
+
+            # ✅ PERFORMANCE: stream rows in batches instead of fetchall(),
+            # so large tables never sit fully materialized in memory
+            cursor.arraysize = 1000
+
+            total_rows = 0
             successful_rows = 0
             skipped_rows = 0
             error_rows = 0
-            
+
             # Process each row
-            for idx, row in enumerate(rows, 1):
-                try:
-                    # Convert row to dictionary
-                    row_dict = dict(zip(columns, row))
-                    
-                    # Process the row
-                    result = self.process_row(row_dict)
-                    
-                    if result is not None:
-                        successful_rows += 1
-                        if (successful_rows % 10) == 0:
-                            pass
-                            # print(f"Processed {successful_rows} rows...")
-                    else:
-                        skipped_rows += 1
-                        
-                except Exception as e:
-                    error_rows += 1
-                    error_msg = f"Error processing row {idx}: {str(e)}"
-                    self.warnings.append(error_msg)
-                    # print(f"❌ {error_msg}")
-            
+            while True:
+                chunk = cursor.fetchmany(cursor.arraysize)
+                if not chunk:
+                    break
+
+                for row in chunk:
+                    total_rows += 1
+                    try:
+                        # Convert row to dictionary
+                        row_dict = dict(zip(columns, row))
+
+                        # Process the row
+                        result = self.process_row(row_dict)
+
+                        if result is not None:
+                            successful_rows += 1
+                        else:
+                            skipped_rows += 1
+
+                    except Exception as e:
+                        error_rows += 1
+                        error_msg = f"Error processing row {total_rows}: {str(e)}"
+                        self.warnings.append(error_msg)
+                        logger.debug(error_msg)
+
             conn.close()
             
             # Summary
-            # print(f"\n=== Import Summary ===")
-            # print(f"Total rows: {len(rows)}")
-            # print(f"✓ Successfully imported: {successful_rows}")
-            # print(f"⊘ Skipped: {skipped_rows}")
-            # print(f"✗ Errors: {error_rows}")
-            # print(f"Final graph size: {len(self.graph.nodes)} nodes, {len(self.graph.edges)} edges")
+            logger.debug("PyArchInit import: %d rows, %d imported, %d skipped, %d errors; "
+                         "graph size %d nodes, %d edges",
+                         total_rows, successful_rows, skipped_rows, error_rows,
+                         len(self.graph.nodes), len(self.graph.edges))
             
             # Add to warnings for UI
             self.warnings.append(f"\nImport summary:")
-            self.warnings.append(f"Successfully imported: {successful_rows}/{len(rows)}")
+            self.warnings.append(f"Successfully imported: {successful_rows}/{total_rows}")
             if skipped_rows > 0:
                 self.warnings.append(f"Skipped rows (not in graph): {skipped_rows}")
             if error_rows > 0:
@@ -281,3 +395,7 @@ class PyArchInitImporter(BaseImporter):
             import traceback
             traceback.print_exc()
             raise ImportError(f"Error parsing pyArchInit database: {str(e)}")
+        finally:
+            self._name_index = None
+            if gc_was_enabled:
+                gc.enable()
@@ -1,10 +1,73 @@
 # s3Dgraphy/importer/xlsx_importer.py
 
-import pandas as pd
+import logging
 from typing import Dict, Any
 from .base_importer import BaseImporter
 from ..graph import Graph
 
+# ✅ PERFORMANCE: openpyxl è importato solo quando un file Excel viene
+# davvero letto: questo modulo è caricato da "import s3dgraphy" anche da chi
+# non usa mai Excel. Gli helper condivisi con mapped_xlsx_importer stanno in
+# _excel_common, senza pandas/numpy
+
+logger = logging.getLogger(__name__)
+
+
+def _iter_mapped_records(filepath, sheet_name, header_row, column_maps):
+    """
+    Stream the rows of a sheet as dicts restricted to the mapped columns.
+
+    Mirrors what pd.read_excel(skiprows=header_row - 1) produced: the first
+    occurrence of a duplicated header wins, NA strings become None, blank
+    rows inside the table are kept and trailing blank rows are dropped.
+
+    Args:
+        filepath: Path of the workbook
+        sheet_name: Sheet name or index
+        header_row: 1-based sheet row holding the column headers
+        column_maps: Mapping of column name -> column configuration
+    """
+    from openpyxl import load_workbook
+    from ._excel_common import _NA_VALUES, _resolve_sheet_name
+
+    na_values = frozenset(_NA_VALUES)
+    # read_only: celle lette in streaming dall'XML, senza costruire un DataFrame
+    workbook = load_workbook(filepath, read_only=True, data_only=True, keep_links=False)
+    try:
+        worksheet = workbook[_resolve_sheet_name(workbook.sheetnames, sheet_name)]
+        worksheet.reset_dimensions()
+        rows = worksheet.iter_rows(min_row=header_row, values_only=True)
+
+        header = next(rows, None)
+        if header is None:
+            return
+        positions = {}
+        for idx, col in enumerate(header):
+            if col in column_maps and col not in positions:
+                positions[col] = idx
+        kept = tuple(positions.items())
+
+        pending_blank = 0
+        for row in rows:
+            if all(value is None or value == '' for value in row):
+                # Tenute solo se seguite da altre righe, come in pandas
+                pending_blank += 1
+                continue
+            for _ in range(pending_blank):
+                yield dict.fromkeys(positions)
+            pending_blank = 0
+
+            width = len(row)
+            record = {}
+            for col, idx in kept:
+                value = row[idx] if idx < width else None
+                if isinstance(value, str) and value in na_values:
+                    value = None
+                record[col] = value
+            yield record
+    finally:
+        workbook.close()
+
 class XLSXImporter(BaseImporter):
     """
     Importer for Excel (.xlsx) files.
@@ -59,18 +122,6 @@ class XLSXImporter(BaseImporter):
             start_row = table_settings.get('start_row', 0)
             sheet_name = table_settings.get('sheet_name', 0)
             
-            # ✅ Leggi Excel con pandas
-            df = pd.read_excel(
-                self.filepath,
-                sheet_name=sheet_name,
-                skiprows=start_row - 1 if start_row > 0 else 0,
-                na_values=['', 'NA', 'N/A'],
-                keep_default_na=True
-            )
-            
-            if df.empty:
-                raise ValueError("Excel file is empty")
-            
             column_maps = self.mapping.get('column_mappings', {})
             if not column_maps:
                 raise ValueError("No column mappings found")
@@ -80,30 +131,17 @@ class XLSXImporter(BaseImporter):
             successful_rows = 0
             skipped_rows = 0
             
-            # ✅ FIX PRINCIPALE: Usa i nomi delle colonne del DataFrame, non l'ordine del JSON
-            for _, row in df.iterrows():
+            # ✅ FIX PRINCIPALE: Usa i nomi delle colonne del foglio, non l'ordine del JSON
+            # ✅ PERFORMANCE: righe lette in streaming con openpyxl read_only,
+            # già filtrate sulle colonne del mapping e con NaN -> None,
+            # invece di costruire un DataFrame di tutto il foglio
+            records = _iter_mapped_records(
+                self.filepath, sheet_name, max(start_row, 1), column_maps)
+
+            for cleaned_row in records:
                 total_rows += 1
                 try:
-                    # STEP 1: Converti la riga in dizionario usando i NOMI delle colonne del DataFrame
-                    # Questo risolve il problema del disallineamento colonne
-                    row_dict = row.to_dict()
-                    
-                    # STEP 2: Filtra solo le colonne presenti nel mapping
-                    # Ignora colonne extra nell'Excel che non sono nel mapping
-                    filtered_row = {k: v for k, v in row_dict.items() if k in column_maps}
-                    
-                    # STEP 3: Opzionale - pulisci i valori NaN esplicitamente PRIMA del processing
-                    # Questo evita che NaN arrivino a _create_property
-                    import pandas as pd
-                    cleaned_row = {}
-                    for k, v in filtered_row.items():
-                        # Converti NaN in None per gestione consistente
-                        if pd.isna(v):
-                            cleaned_row[k] = None
-                        else:
-                            cleaned_row[k] = v
-                    
-                    # STEP 4: Processa la riga con i dati corretti
+                    # Processa la riga con i dati corretti
                     result_node = self.process_row(cleaned_row)
                     
                     if result_node is not None:
@@ -113,7 +151,14 @@ class XLSXImporter(BaseImporter):
                         
                 except Exception as e:
                     self.warnings.append(f"Error processing row {total_rows}: {str(e)}")
+                    logger.debug("Error processing row %d: %s", total_rows, e)
             
+            if total_rows == 0:
+                raise ValueError("Excel file is empty")
+
+            logger.debug("XLSX import: %d rows, %d imported, %d skipped",
+                         total_rows, successful_rows, skipped_rows)
+
             # ✅ Aggiungi summary alle warnings
             self.warnings.extend([
                 f"\nImport summary:",
@@ -136,7 +181,12 @@ class XLSXImporter(BaseImporter):
             list: List of sheet names
         """
         try:
-            return pd.ExcelFile(self.filepath).sheet_names
+            from openpyxl import load_workbook
+            workbook = load_workbook(self.filepath, read_only=True, keep_links=False)
+            try:
+                return workbook.sheetnames
+            finally:
+                workbook.close()
         except Exception as e:
             self.warnings.append(f"Error reading sheet names: {str(e)}")
             return []
\ No newline at end of file
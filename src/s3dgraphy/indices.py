@@ -14,15 +14,13 @@ class GraphIndices:
         # Nodi per tipo
         self.nodes_by_type = {}
 
-        # Property nodes
-        self.property_nodes_by_name = {}
-        self.property_values_by_name = {}  # {prop_name: set(values)}
-
-        # Relazioni stratigrafiche-proprietà
-        self.strat_to_properties = {}  # {strat_id: {prop_name: value}}
-        self.properties_to_strat = {}  # {prop_name: {value: [strat_ids]}}
+        self.clear_property_indices()
 
         # Edges
+        # ✅ OPTIMIZATION: Edge ID -> Edge and (source, target, type) keys
+        # for O(1) existence checks
+        self.edges_by_id = {}
+        self.edge_keys = set()
         self.edges_by_type = {}
         self.edges_by_source = {}
         self.edges_by_target = {}
@@ -31,6 +29,16 @@ class GraphIndices:
         self.edges_by_source_type = {}  # {(source_id, edge_type): [edges]}
         self.edges_by_target_type = {}  # {(target_id, edge_type): [edges]}
     
+    def clear_property_indices(self):
+        """Cleans the property indexes (derived from property node values)"""
+        # Property nodes
+        self.property_nodes_by_name = {}
+        self.property_values_by_name = {}  # {prop_name: set(values)}
+
+        # Relazioni stratigrafiche-proprietà
+        self.strat_to_properties = {}  # {strat_id: {prop_name: value}}
+        self.properties_to_strat = {}  # {prop_name: {value: [strat_ids]}}
+
     def add_node(self, node):
         """Adds a node to all relevant indices"""
         # ✅ OPTIMIZATION: Add to node_id index
@@ -62,6 +70,9 @@ class GraphIndices:
     
     def add_edge(self, edge):
         """Adds an edge to indices"""
+        self.edges_by_id[edge.edge_id] = edge
+        self.edge_keys.add((edge.edge_source, edge.edge_target, edge.edge_type))
+
         # Per tipo
         if edge.edge_type not in self.edges_by_type:
             self.edges_by_type[edge.edge_type] = []
@@ -6,7 +6,24 @@ Allows applications to register custom mapping directories.
 import os
 import json
 from importlib.resources import files
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _parse_mapping_json(data: bytes) -> Any:
+    """Parse mapping JSON with orjson when installed, else with the json module."""
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # json accetta anche NaN/Infinity e interi oltre i 64 bit;
+            # se il file è davvero invalido solleva l'errore standard
+            pass
+    return json.loads(data)
 
 class MappingRegistry:
     """Registry for managing mapping file directories and search paths."""
@@ -17,6 +34,14 @@ class MappingRegistry:
             'emdb': [],
             'generic': []
         }
+        # ✅ PERFORMANCE: cache invalidate via os.stat (mtime/size), così
+        # import ripetuti non rileggono né riparsano i file dal disco
+        # directory -> (st_mtime_ns, [(json file name, path)])
+        self._dir_cache: Dict[str, Tuple[int, List[Tuple[str, str]]]] = {}
+        # file path -> ((st_mtime_ns, st_size), raw file bytes)
+        self._file_cache: Dict[str, Tuple[Tuple[int, int], bytes]] = {}
+        # file path -> ((st_mtime_ns, st_size), (file_id, display_name, description))
+        self._summary_cache: Dict[str, Tuple[Tuple[int, int], tuple]] = {}
         self._initialize_builtin_paths()
     
     def _initialize_builtin_paths(self):
@@ -113,12 +138,50 @@ class MappingRegistry:
             return None
         
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            # Parse a fresh dict every time: callers are free to modify it
+            return _parse_mapping_json(self._read_mapping_bytes(file_path))
         except (json.JSONDecodeError, IOError) as e:
             # print(f"Error loading mapping {mapping_name}: {str(e)}")
             return None
     
+    def _read_mapping_bytes(self, file_path: str, key: Optional[Tuple[int, int]] = None) -> bytes:
+        """
+        Return the raw bytes of a mapping file, re-reading it only when it changed on disk.
+
+        The JSON parsers decode UTF-8 directly from bytes, so the file is never
+        decoded to an intermediate str.
+
+        Args:
+            file_path: Path of the mapping file
+            key: (st_mtime_ns, st_size) when the caller already has a fresh stat
+        """
+        if key is None:
+            st = os.stat(file_path)
+            key = (st.st_mtime_ns, st.st_size)
+        cached = self._file_cache.get(file_path)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+
+        with open(file_path, 'rb') as f:
+            data = f.read()
+        self._file_cache[file_path] = (key, data)
+        return data
+
+    def _list_json_files(self, directory: str) -> List[Tuple[str, str]]:
+        """Return (name, path) of the .json files in a directory, re-scanning it only when it changed."""
+        mtime = os.stat(directory).st_mtime_ns
+        cached = self._dir_cache.get(directory)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+        # ✅ PERFORMANCE: scandir fornisce nome e percorso completo di ogni
+        # voce in una sola lettura della directory
+        with os.scandir(directory) as entries:
+            json_files = [(entry.name, entry.path) for entry in entries
+                          if entry.name.endswith('.json')]
+        self._dir_cache[directory] = (mtime, json_files)
+        return json_files
+
     def list_available_mappings(self, mapping_type: str) -> List[tuple]:
         """
         List all available mappings for a type.
@@ -132,23 +195,28 @@ class MappingRegistry:
         directories = self.get_mapping_directories(mapping_type)
         
         for directory in directories:
-            if not os.path.exists(directory):
-                continue
-                
+            # Directory mancanti: os.stat/os.scandir sollevano OSError (saltata sotto)
             try:
-                for file in os.listdir(directory):
-                    if file.endswith('.json') and file not in seen_files:
+                for file, file_path in self._list_json_files(directory):
+                    if file not in seen_files:
                         seen_files.add(file)
                         
-                        file_path = os.path.join(directory, file)
                         file_id = os.path.splitext(file)[0]
                         
                         try:
-                            with open(file_path, 'r', encoding='utf-8') as f:
-                                data = json.load(f)
-                                display_name = data.get("name", file_id)
-                                description = data.get("description", "")
-                                mappings.append((file_id, display_name, description))
+                            st = os.stat(file_path)
+                            key = (st.st_mtime_ns, st.st_size)
+                            cached = self._summary_cache.get(file_path)
+                            if cached is not None and cached[0] == key:
+                                mappings.append(cached[1])
+                                continue
+
+                            data = _parse_mapping_json(self._read_mapping_bytes(file_path, key))
+                            display_name = data.get("name", file_id)
+                            description = data.get("description", "")
+                            summary = (file_id, display_name, description)
+                            self._summary_cache[file_path] = (key, summary)
+                            mappings.append(summary)
                         except Exception as e:
                             # print(f"Error reading mapping {file}: {str(e)}")
                             # Fallback: usa il nome del file
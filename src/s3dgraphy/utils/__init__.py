@@ -1,8 +1,9 @@
-from .utils import convert_shape2type, debug_graph_structure, manage_id_prefix, get_base_name, add_graph_prefix, get_ai_prompt
+from .utils import convert_shape2type, debug_graph_structure, iter_graph_debug, manage_id_prefix, get_base_name, add_graph_prefix, get_ai_prompt
 
 __all__ = [
     "convert_shape2type",
     "debug_graph_structure",
+    "iter_graph_debug",
     "manage_id_prefix",
     "get_base_name",
     "add_graph_prefix",
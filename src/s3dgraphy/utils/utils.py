@@ -1,8 +1,17 @@
 # s3Dgraphy/utils/utils.py
 import os
+import sys
 import json
+import logging
+import functools
+from collections import Counter
 from importlib.resources import files
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 """
 Utilities for the s3Dgraphy library.
 
@@ -29,71 +38,138 @@ from ..nodes.stratigraphic_node import (
     ContinuityNode
 )
 
+logger = logging.getLogger(__name__)
+
+
+def iter_graph_debug(graph, node_id=None):
+    """
+    Genera le informazioni sulla struttura del grafo come record (kind, payload).
+    Se node_id è specificato, si concentra sulle relazioni di quel nodo.
+
+    Args:
+        graph: Il grafo da analizzare
+        node_id: ID del nodo su cui concentrarsi (opzionale)
+
+    Yields:
+        tuple: (kind, payload). With node_id: ("node", (node_id, node_type, name)),
+        ("out_edges", count), ("out_edge", (target_id, target_type, edge_type)),
+        ("in_edges", count), ("in_edge", (source_id, source_type, edge_type));
+        nothing if the node does not exist. Without node_id: ("nodes", count),
+        ("node_type", (node_type, count)), ("edges", count),
+        ("edge_type", (edge_type, count)).
+    """
+    if node_id:
+        # ✅ PERFORMANCE: indici del grafo (ricostruiti al più una volta)
+        # invece di due scansioni complete di graph.edges
+        indices = graph.indices
+        nodes_by_id = indices.nodes_by_id
+        node = nodes_by_id.get(node_id)
+        if not node:
+            return
+
+        yield "node", (node_id, node.node_type, node.name)
+
+        out_edges = indices.edges_by_source.get(node_id, ())
+        yield "out_edges", len(out_edges)
+        for e in out_edges:
+            target = nodes_by_id.get(e.edge_target)
+            target_type = target.node_type if target else "Unknown"
+            yield "out_edge", (e.edge_target, target_type, e.edge_type)
+
+        in_edges = indices.edges_by_target.get(node_id, ())
+        yield "in_edges", len(in_edges)
+        for e in in_edges:
+            source = nodes_by_id.get(e.edge_source)
+            source_type = source.node_type if source else "Unknown"
+            yield "in_edge", (e.edge_source, source_type, e.edge_type)
+    else:
+        # ✅ PERFORMANCE: Counter invece del doppio lookup
+        # "if key not in dict" ad ogni nodo e arco
+        yield "nodes", len(graph.nodes)
+        for ntype, count in Counter(node.node_type for node in graph.nodes).items():
+            yield "node_type", (ntype, count)
+
+        yield "edges", len(graph.edges)
+        for etype, count in Counter(edge.edge_type for edge in graph.edges).items():
+            yield "edge_type", (etype, count)
+
+
+# Testo di debug_graph_structure per ogni tipo di record di iter_graph_debug
+_GRAPH_DEBUG_FORMATS = {
+    "node": "\nNode details {0[0]} ({0[1]}):\n  Nome: {0[2]}",
+    "out_edges": "  Outgoing Edges: {0}",
+    "out_edge": "    -> {0[0]} ({0[1]}) via {0[2]}",
+    "in_edges": "  Ingoing Edges: {0}",
+    "in_edge": "    <- {0[0]} ({0[1]}) via {0[2]}",
+    "nodes": "Total number of nodes: {0}",
+    "node_type": "  - {0[0]}: {0[1]} nodes",
+    "edges": "\nTotal number of edges: {0}",
+    "edge_type": "  - {0[0]}: {0[1]} edges",
+}
+
 
 def debug_graph_structure(graph, node_id=None, max_depth=5, current_depth=0):
     """
-    Stampa informazioni dettagliate sulla struttura del grafo.
+    Registra (logging, livello DEBUG) informazioni dettagliate sulla struttura del grafo.
     Se node_id è specificato, si concentra sulle relazioni di quel nodo.
     
     Args:
         graph: Il grafo da analizzare
         node_id: ID del nodo su cui concentrarsi (opzionale)
-        max_depth: Profondità massima di ricorsione
-        current_depth: Profondità corrente di ricorsione
+        max_depth: Deprecated, ignored. Kept for backwards compatibility.
+        current_depth: Deprecated, ignored. Kept for backwards compatibility.
     """
-    # Prevent infinite recursion
-    if current_depth >= max_depth:
-        # print(f"Limite di profondità ricorsiva ({max_depth}) raggiunto.")
+    # La funzione non è ricorsiva: max_depth/current_depth non limitano nulla
+
+    # ✅ PERFORMANCE: nessun lavoro se il livello DEBUG non è attivo;
+    # altrimenti un unico messaggio invece di una scrittura per riga
+    if not logger.isEnabledFor(logging.DEBUG):
         return
-        
-    
-    
-    if node_id:
-        # print("\n=== DEBUG NODE STRUCTURE ===")
-        node = graph.find_node_by_id(node_id)
-        if node:
-            # print(f"\nNode details {node_id} ({node.node_type}):")
-            # print(f"  Nome: {node.name}")
-            
-            out_edges = [e for e in graph.edges if e.edge_source == node_id]
-            in_edges = [e for e in graph.edges if e.edge_target == node_id]
-            
-            # print(f"  Outgoing Edges: {len(out_edges)}")
-            for e in out_edges:
-                target = graph.find_node_by_id(e.edge_target)
-                target_type = target.node_type if target else "Unknown"
-                # print(f"    -> {e.edge_target} ({target_type}) via {e.edge_type}")
-            
-            # print(f"  Ingoing Edges: {len(in_edges)}")
-            for e in in_edges:
-                source = graph.find_node_by_id(e.edge_source)
-                source_type = source.node_type if source else "Unknown"
-                # print(f"    <- {e.edge_source} ({source_type}) via {e.edge_type}")
-            
-    else:
-        # print("\n=== DEBUG GRAPH STRUCTURE ===")
-        node_types = {}
-        for node in graph.nodes:
-            if node.node_type not in node_types:
-                node_types[node.node_type] = []
-            node_types[node.node_type].append(node)
-        
-        # print(f"Total number of nodes: {len(graph.nodes)}")
-        for ntype, nodes in node_types.items():
-            pass
-            # print(f"  - {ntype}: {len(nodes)} nodes")
-        
-        # print(f"\nTotal number of edges: {len(graph.edges)}")
-        edge_types = {}
-        for edge in graph.edges:
-            if edge.edge_type not in edge_types:
-                edge_types[edge.edge_type] = 0
-            edge_types[edge.edge_type] += 1
-        
-        for etype, count in edge_types.items():
-            pass
-            # print(f"  - {etype}: {count} edges")
-    # print("=== END DEBUG ===\n")
+
+    title = "DEBUG NODE STRUCTURE" if node_id else "DEBUG GRAPH STRUCTURE"
+    lines = [f"\n=== {title} ==="]
+    lines.extend(_GRAPH_DEBUG_FORMATS[kind].format(payload)
+                 for kind, payload in iter_graph_debug(graph, node_id))
+    lines.append("=== END DEBUG ===\n")
+    logger.debug("\n".join(lines))
+
+# ✅ PERFORMANCE: conversione forma/bordo yEd -> tipo con lookup su
+# dizionario invece di una catena di if/elif (chiamata per ogni nodo
+# durante l'import GraphML)
+
+# Colori dei bordi EM, internati: l'import GraphML interna i colori letti,
+# quindi il confronto delle chiavi avviene per identità
+_BORDER_USD = sys.intern("#D86400")
+_BORDER_USVN = sys.intern("#31792D")
+_BORDER_USVS = sys.intern("#248FE7")
+_BORDER_SU = sys.intern("#9B3333")
+_BORDER_SF = sys.intern("#D8BD30")
+_BORDER_VSF = sys.intern("#B19F61")
+
+# Forme il cui tipo dipende dal colore del bordo
+_SHAPE2TYPE_BY_BORDER = {
+    ("ellipse", _BORDER_USD): ("serUSD", "Series of USD"),
+    ("ellipse", _BORDER_USVN): ("serUSVn", "Series of USVn"),
+    ("ellipse", _BORDER_USVS): ("serUSVs", "Series of USVs"),
+    ("ellipse", _BORDER_SU): ("serSU", "Series of SU"),
+    ("octagon", _BORDER_SF): ("SF", "Special Find"),
+    ("octagon", _BORDER_VSF): ("VSF", "Virtual Special Find"),
+    # Reused Special Find (spolia). Same red border as serSU but
+    # serSU is an ellipse, so the shape disambiguates the two.
+    ("octagon", _BORDER_SU): ("RSF", "Reused Special Find"),
+}
+
+# Forme il cui tipo non dipende dal colore del bordo
+_SHAPE2TYPE_ANY_BORDER = {
+    "rectangle": ("US", "Stratigraphic Unit"),
+    "parallelogram": ("USVs", "Structural Virtual Stratigraphic Units"),
+    "hexagon": ("USVn", "Non-Structural Virtual Stratigraphic Units"),
+    "roundrectangle": ("USD", "Documentary Stratigraphic Unit"),
+    "diamond": ("BR", "Continuity Node"),
+}
+
+_SHAPE2TYPE_UNKNOWN = ("unknown", "Unrecognized node")
+
 
 def convert_shape2type(yedtype, border_style, border_type="line"):
     """
@@ -107,39 +183,16 @@ def convert_shape2type(yedtype, border_style, border_type="line"):
     Returns:
         tuple: A tuple with a short code for the node type and an extended description.
     """
-    if yedtype == "rectangle":
-        nodetype = ("US", "Stratigraphic Unit")
-    elif yedtype == "parallelogram":
-        nodetype = ("USVs", "Structural Virtual Stratigraphic Units")
-    elif yedtype == "ellipse" and border_style == "#D86400":
-        nodetype = ("serUSD", "Series of USD")
-    elif yedtype == "ellipse" and border_style == "#31792D":
-        nodetype = ("serUSVn", "Series of USVn")
-    elif yedtype == "ellipse" and border_style == "#248FE7":
-        nodetype = ("serUSVs", "Series of USVs")
-    elif yedtype == "ellipse" and border_style == "#9B3333":
-        nodetype = ("serSU", "Series of SU")
-    elif yedtype == "hexagon":
-        nodetype = ("USVn", "Non-Structural Virtual Stratigraphic Units")
-    elif yedtype == "octagon" and border_style == "#D8BD30":
-        nodetype = ("SF", "Special Find")
-    elif yedtype == "octagon" and border_style == "#B19F61":
-        nodetype = ("VSF", "Virtual Special Find")
-    elif yedtype == "octagon" and border_style == "#9B3333":
-        # Reused Special Find (spolia). Same red border as serSU but
-        # serSU is an ellipse, so the shape disambiguates the two.
-        nodetype = ("RSF", "Reused Special Find")
-    elif yedtype == "roundrectangle" and border_type == "dashed":
-        nodetype = ("TSU", "Transformation Stratigraphic Unit")
-    elif yedtype == "roundrectangle":
-        nodetype = ("USD", "Documentary Stratigraphic Unit")
-    elif yedtype == "diamond":
-        nodetype = ("BR", "Continuity Node")
-    else:
-        # print(f"Unrecognized node type and style: yedtype='{yedtype}', border_style='{border_style}'")
-        nodetype = ("unknown", "Unrecognized node")
-        
-    return nodetype
+    nodetype = _SHAPE2TYPE_BY_BORDER.get((yedtype, border_style))
+    if nodetype is not None:
+        return nodetype
+
+    # Il rettangolo arrotondato tratteggiato è una TSU, non una USD
+    if yedtype == "roundrectangle" and border_type == "dashed":
+        return ("TSU", "Transformation Stratigraphic Unit")
+
+    # print(f"Unrecognized node type and style: yedtype='{yedtype}', border_style='{border_style}'")
+    return _SHAPE2TYPE_ANY_BORDER.get(yedtype, _SHAPE2TYPE_UNKNOWN)
 
 
 # ──────────────────────────────────────────────────────────────────
@@ -173,18 +226,20 @@ STRATIGRAPHIC_CLASS_MAP = {
     "BR":      ContinuityNode,
 }
 
-def get_stratigraphic_node_class(stratigraphic_type):
-    """
-    Returns the stratigraphic node class corresponding to the specified type.
+class _StratigraphicClassLookup(dict):
+    """STRATIGRAPHIC_CLASS_MAP with StratigraphicNode as fallback for unknown types."""
 
-    Args:
-        stratigraphic_type (str): The type of stratigraphic unit.
+    def __missing__(self, stratigraphic_type):
+        return StratigraphicNode
 
-    Returns:
-        class: The corresponding stratigraphic node class.
-    """
-    # Usa StratigraphicUnit come fallback se il tipo non è nella mappa
-    return STRATIGRAPHIC_CLASS_MAP.get(stratigraphic_type, StratigraphicNode)
+
+# get_stratigraphic_node_class(stratigraphic_type) returns the stratigraphic
+# node class corresponding to the specified type (StratigraphicNode if the
+# type is not in the map).
+# ✅ PERFORMANCE: è chiamata per ogni nodo durante gli import, quindi è
+# direttamente il __getitem__ (in C) della mappa, senza un frame Python per
+# chiamata; solo i tipi sconosciuti passano da __missing__
+get_stratigraphic_node_class = _StratigraphicClassLookup(STRATIGRAPHIC_CLASS_MAP).__getitem__
 
 def get_material_color(matname, rules_path=None):
     """
@@ -200,15 +255,23 @@ def get_material_color(matname, rules_path=None):
         un materiale
     """
     try:
+        # ✅ PERFORMANCE: regole lette e parsate una volta sola, non ad ogni
+        # nodo, e ridotte a una tabella piatta matname -> colore
         if rules_path is None:
-            rules_resource = files("s3dgraphy").joinpath(
-                "JSON_config/em_visual_rules.json"
-            )
-            with rules_resource.open('r', encoding='utf-8') as f:
-                rules = json.load(f)
+            colors = _default_material_colors()
         else:
-            with open(rules_path, 'r', encoding='utf-8') as f:
-                rules = json.load(f)
+            mtime_ns = os.stat(rules_path).st_mtime_ns
+            colors = _load_material_colors(rules_path, mtime_ns)
+
+        color = colors.get(matname, _NO_COLOR_ENTRY)
+        if color is not _NO_COLOR_ENTRY:
+            return color
+
+        # Stili assenti o malformati: percorso completo (e fallback) sulle regole
+        if rules_path is None:
+            rules = _load_visual_rules()
+        else:
+            rules = _load_rules_file(rules_path, mtime_ns)
 
         node_style = rules["node_styles"].get(matname, {})
         style = node_style.get("style", {})
@@ -228,6 +291,53 @@ def get_material_color(matname, rules_path=None):
         return None
 
 
+def get_material_colors(matnames, rules_path=None):
+    """
+    Colori di materiale per molti nodi in una volta, come array NumPy.
+
+    Ogni nome distinto è risolto una sola volta con get_material_color
+    (stesse regole e stesso fallback).
+
+    Args:
+        matnames (Iterable[str]): Nomi dei materiali/tipi di unità stratigrafica
+        rules_path (str, optional): Percorso al file JSON delle regole. Se None,
+            usa il path di default.
+
+    Returns:
+        numpy.ndarray: Array float32 di forma (N, 4) con i valori RGBA tra 0 e 1;
+        le righe dei nodi che non prevedono un materiale sono NaN
+    """
+    # ✅ PERFORMANCE: NumPy importato solo da chi usa l'API bulk
+    import numpy as np
+
+    resolved = {}
+    rows = []
+    for matname in matnames:
+        color = resolved.get(matname)
+        if color is None:
+            color = get_material_color(matname, rules_path) or _NO_MATERIAL_ROW
+            resolved[matname] = color
+        rows.append(color)
+    # Un solo buffer contiguo invece di N tuple (utilizzabile via buffer protocol)
+    return np.array(rows, dtype=np.float32).reshape(len(rows), 4)
+
+
+# Riga di get_material_colors per i nodi senza materiale
+_NO_MATERIAL_ROW = (float("nan"),) * 4
+
+
+def _parse_rules_json(data):
+    """Parse visual rules JSON bytes with orjson when installed, else with the json module."""
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # json accetta anche NaN/Infinity; se il file è davvero invalido
+            # solleva json.JSONDecodeError, già gestito dai chiamanti
+            pass
+    return json.loads(data)
+
+
 # Cache for the loaded visual rules file. Loaded lazily; reloadable
 # for tests via ``_reload_visual_rules``.
 _VISUAL_RULES_CACHE = None
@@ -240,8 +350,7 @@ def _load_visual_rules():
     try:
         rules_resource = files("s3dgraphy").joinpath(
             "JSON_config/em_visual_rules.json")
-        with rules_resource.open('r', encoding='utf-8') as f:
-            _VISUAL_RULES_CACHE = json.load(f)
+        _VISUAL_RULES_CACHE = _parse_rules_json(rules_resource.read_bytes())
     except (FileNotFoundError, json.JSONDecodeError,
             ModuleNotFoundError) as e:
         print(f"[s3dgraphy] _load_visual_rules fallback: "
@@ -250,6 +359,65 @@ def _load_visual_rules():
     return _VISUAL_RULES_CACHE
 
 
+@functools.lru_cache(maxsize=4)
+def _load_rules_file(rules_path, mtime_ns):
+    """
+    Parse a custom visual rules file.
+
+    The modification time is part of the cache key, so an edited file is
+    parsed again. Errors are not cached and propagate to the caller.
+    """
+    with open(rules_path, 'rb') as f:
+        return _parse_rules_json(f.read())
+
+
+# Marks a matname with no usable entry in a flattened material table
+_NO_COLOR_ENTRY = object()
+
+
+def _flatten_material_colors(rules):
+    """
+    Map each node style name to the value get_material_color returns for it.
+
+    Styles whose entry is malformed are left out, so that get_material_color
+    goes through the full rules (and its fallback) for them.
+
+    Args:
+        rules (dict): Parsed visual rules
+
+    Returns:
+        dict: matname -> (R, G, B, A) tuple, or None when the style has no material
+    """
+    colors = {}
+    node_styles = rules.get("node_styles") if isinstance(rules, dict) else None
+    if not isinstance(node_styles, dict):
+        return colors
+
+    for matname, node_style in node_styles.items():
+        try:
+            style = node_style.get("style", {})
+            if "material" not in style:
+                colors[matname] = None
+                continue
+            color = style["material"]["color"]
+            colors[matname] = (color["r"], color["g"], color["b"], color.get("a", 1.0))
+        except (KeyError, TypeError, AttributeError):
+            continue
+    return colors
+
+
+@functools.lru_cache(maxsize=1)
+def _default_material_colors():
+    """Flattened material table of the default visual rules."""
+    return _flatten_material_colors(_load_visual_rules())
+
+
+@functools.lru_cache(maxsize=4)
+def _load_material_colors(rules_path, mtime_ns):
+    """Flattened material table of a custom visual rules file."""
+    return _flatten_material_colors(_load_rules_file(rules_path, mtime_ns))
+
+
 def get_document_vocabularies():
     """Derive the three canonical Master-Document vocabularies from
     ``em_visual_rules.json``.
@@ -350,13 +518,17 @@ def get_graph_code_from_node(node):
     Returns:
         str: Il codice del grafo o None se non disponibile
     """
-    # Se il nome è prefissato (contiene _)
-    if '_' in node.name:
-        return node.name.split('_', 1)[0]
+    # Se il nome è prefissato (contiene _): una sola scansione con partition
+    graph_code, prefixed, _ = node.name.partition('_')
+    if prefixed:
+        return graph_code
     
     # Altrimenti, cerca negli attributi
     return node.attributes.get('graph_code')
 
+_VALID_ACTIONS = frozenset({'add', 'remove'})
+
+
 def manage_id_prefix(name: str, graph_code: str = None, action: str = 'add', separator: str = '.') -> str:
     """
     Add or remove graph code prefix from element names.
@@ -366,7 +538,7 @@ def manage_id_prefix(name: str, graph_code: str = None, action: str = 'add', sep
     (e.g., 3D object names in Blender, database primary keys, file systems).
     
     The function handles edge cases gracefully:
-    - Adding a prefix when one already exists (replaces old prefix)
+    - Adding a prefix the name already has (returns name unchanged)
     - Removing prefix when none exists (returns name unchanged)
     - Handling empty or None values
     
@@ -394,7 +566,7 @@ def manage_id_prefix(name: str, graph_code: str = None, action: str = 'add', sep
         >>> manage_id_prefix('GT15.US001', None, 'remove')
         'US001'
         
-        >>> manage_id_prefix('GT15.US001', 'VDL16', 'add')
+        >>> manage_id_prefix('VDL16.US001', 'VDL16', 'add')
         'VDL16.US001'
         
         >>> manage_id_prefix('US001', None, 'add')
@@ -404,40 +576,49 @@ def manage_id_prefix(name: str, graph_code: str = None, action: str = 'add', sep
         ''
     """
     # Validate action parameter
-    if action not in ['add', 'remove']:
+    if action not in _VALID_ACTIONS:
         raise ValueError(f"Invalid action '{action}'. Must be 'add' or 'remove'.")
     
-    # Handle empty or None names
-    if not name or name.strip() == '':
+    # Handle empty or None names (isspace() non alloca una copia come strip())
+    if not name or name.isspace():
         return name
     
     # Remove action
     if action == 'remove':
-        # If the name contains the separator, split and return the part after first separator
-        if separator in name:
-            parts = name.split(separator, 1)  # Split only on first occurrence
-            return parts[1] if len(parts) > 1 else name
-        # No separator found, return name as-is
+        return _remove_id_prefix(name, separator)
+
+    # Add action: if no graph_code provided, return name unchanged
+    if not graph_code or graph_code.isspace():
         return name
-    
-    # Add action
-    if action == 'add':
-        # If no graph_code provided, return name unchanged
-        if not graph_code or graph_code.strip() == '':
-            return name
-
-        # Check if name already has this graph_code as prefix
-        if name.startswith(f"{graph_code}{separator}"):
-            # Already has the correct prefix, return as-is
-            return name
-
-        # Simply prepend the graph code — do NOT strip internal separators
-        # from the name. Names like "D.07" contain separators that are part
-        # of the identifier, not a graph prefix to replace.
-        return f"{graph_code}{separator}{name}"
-    
-    # Should never reach here due to validation above
-    return name
+
+    # ✅ PERFORMANCE: le stesse combinazioni nome/prefisso si ripetono in
+    # import ed export: trasformazioni pure memorizzate con lru_cache
+    return _add_id_prefix(name, graph_code, separator)
+
+
+@functools.lru_cache(maxsize=8192)
+def _remove_id_prefix(name, separator):
+    """manage_id_prefix(name, action='remove') for a non-blank name."""
+    # ✅ PERFORMANCE: una sola scansione con partition: restituisce la parte
+    # dopo il primo separatore, o il nome invariato se non c'è separatore
+    _, found, base_name = name.partition(separator)
+    return base_name if found else name
+
+
+@functools.lru_cache(maxsize=8192)
+def _add_id_prefix(name, graph_code, separator):
+    """manage_id_prefix(name, graph_code, 'add') for a non-blank name and graph_code."""
+    # Check if name already has this graph_code as prefix
+    # (graph_code + separator confrontati in posizione, senza costruire la stringa)
+    if name.startswith(graph_code) and name.startswith(separator, len(graph_code)):
+        # Already has the correct prefix, return as-is
+        return name
+
+    # Simply prepend the graph code — do NOT strip internal separators
+    # from the name. Names like "D.07" contain separators that are part
+    # of the identifier, not a graph prefix to replace.
+    # ✅ PERFORMANCE: join alloca il risultato una sola volta
+    return separator.join((graph_code, name))
 
 
 def get_base_name(name: str, separator: str = '.') -> str:
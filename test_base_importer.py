@@ -0,0 +1,71 @@
+"""BaseImporter regression — ``process_rows`` must give the same result
+as calling ``process_row`` on each row in turn.
+
+Validates invariants:
+
+1. The returned (successful, skipped, errors) counts match what
+   ``process_row`` does with each row.
+2. A row that raises is reported in the warnings and the batch goes on
+   with the next row; no row is processed twice.
+3. Only rows that produced a node are kept for the second pass.
+
+Run with:  python3 test_base_importer.py
+"""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent
+sys.path.insert(0, str(REPO_ROOT / "src"))
+
+from s3dgraphy.graph import Graph  # noqa: E402
+from s3dgraphy.importer.mapped_xlsx_importer import MappedXLSXImporter  # noqa: E402
+from s3dgraphy.nodes.stratigraphic_node import StratigraphicUnit  # noqa: E402
+
+
+def test_process_rows_counts_and_continues_after_errors():
+    """Successful, skipped and failing rows are counted; errors do not stop the batch."""
+    graph = Graph(graph_id="test_graph")
+    graph.add_node(StratigraphicUnit("us1", "US1"))
+    graph.add_node(StratigraphicUnit("us2", "US2"))
+    # Grafo esistente: le righe di nodi assenti vengono saltate
+    importer = MappedXLSXImporter("unused.xlsx", "excel_to_graphml_mapping",
+                                  existing_graph=graph)
+
+    rows = [
+        {"ID": "US1", "TYPE": "US"},
+        {"ID": "US9", "TYPE": "US"},
+        {"TYPE": "US"},
+        {"ID": "US2", "TYPE": "US"},
+    ]
+    consumed = []
+
+    def row_iterator():
+        for row in rows:
+            consumed.append(row)
+            yield row
+
+    successful, skipped, errors = importer.process_rows(row_iterator())
+
+    assert (successful, skipped, errors) == (2, 1, 1), (
+        f"Expected (2, 1, 1), got {(successful, skipped, errors)}")
+    assert consumed == rows, "Rows were skipped or processed twice"
+    assert importer._stored_rows == [rows[0], rows[3]], (
+        f"Unexpected stored rows: {importer._stored_rows}")
+    assert any(w.startswith("Error processing row:") for w in importer.warnings), (
+        f"Row error not reported: {importer.warnings}")
+    assert any("'US9' not found" in w for w in importer.warnings), (
+        f"Skipped row not reported: {importer.warnings}")
+    print(f"  ✓ process_rows: {successful} successful, {skipped} skipped, {errors} error")
+
+
+def run():
+    print("== BaseImporter tests ==")
+    test_process_rows_counts_and_continues_after_errors()
+    print("== OK ==")
+
+
+if __name__ == "__main__":
+    run()
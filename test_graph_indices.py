@@ -0,0 +1,193 @@
+"""Graph index regression — lookups answered by the graph indices must
+agree with ``graph.nodes`` / ``graph.edges`` after every kind of change.
+
+Validates invariants:
+
+1. ``add_nodes_bulk`` skips IDs already in the graph or repeated in the
+   batch, and the added nodes are found by ``find_node_by_id``.
+2. ``add_edges_bulk`` applies the ``add_edge`` connection validation,
+   skips duplicate IDs, and adds nothing when an endpoint is missing.
+3. Nodes and edges added after the indices were built are indexed, and
+   removals are reflected by the lookups and by ``graph.indices``.
+4. ``has_edge`` follows edges added, removed, or retyped in place
+   (``update_edge``, ``refine_edge_types``).
+5. Nodes and edges appended to, or lists assigned to, ``graph.nodes`` /
+   ``graph.edges`` without the graph methods are still found.
+
+Run with:  python3 test_graph_indices.py
+"""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent
+sys.path.insert(0, str(REPO_ROOT / "src"))
+
+from s3dgraphy.graph import Graph  # noqa: E402
+from s3dgraphy.nodes.document_node import DocumentNode  # noqa: E402
+from s3dgraphy.nodes.property_node import PropertyNode  # noqa: E402
+from s3dgraphy.nodes.stratigraphic_node import StratigraphicUnit  # noqa: E402
+
+
+def _make_graph():
+    graph = Graph(graph_id="test_graph")
+    graph.add_nodes_bulk([
+        StratigraphicUnit("us1", "US1"),
+        StratigraphicUnit("us2", "US2"),
+        PropertyNode("prop1", "material", value="stone", description="stone"),
+    ])
+    return graph
+
+
+def test_add_nodes_bulk_skips_duplicates():
+    """Existing IDs and IDs repeated in the batch are not added twice."""
+    graph = _make_graph()
+    first = graph.find_node_by_id("us1")
+
+    added = graph.add_nodes_bulk([
+        StratigraphicUnit("us1", "US1 again"),
+        StratigraphicUnit("us3", "US3"),
+        StratigraphicUnit("us3", "US3 again"),
+    ])
+
+    assert [node.name for node in added] == ["US3"], (
+        f"Expected only US3 to be added, got {[node.name for node in added]}")
+    assert graph.find_node_by_id("us1") is first, "Existing node was replaced"
+    assert graph.find_node_by_id("us3").name == "US3", "Added node not indexed"
+    node_ids = [node.node_id for node in graph.nodes]
+    assert len(node_ids) == len(set(node_ids)), f"Duplicate node IDs: {node_ids}"
+    print(f"  ✓ add_nodes_bulk added 1 of 3 nodes ({len(graph.nodes)} in graph)")
+
+
+def test_add_edges_bulk_validates_and_skips_duplicates():
+    """Edges get add_edge() validation; duplicate IDs are skipped."""
+    graph = _make_graph()
+
+    added = graph.add_edges_bulk([
+        ("e1", "us1", "us2", "is_after"),
+        ("e2", "us1", "prop1", "has_property"),
+        ("e3", "prop1", "us1", "is_after"),
+        ("e1", "us2", "us1", "is_after"),
+    ])
+
+    types = {edge.edge_id: edge.edge_type for edge in added}
+    assert types == {"e1": "is_after", "e2": "has_property",
+                     "e3": "generic_connection"}, f"Unexpected edges: {types}"
+    assert graph.find_edge_by_id("e1").edge_source == "us1", "Duplicate ID replaced e1"
+    assert graph.add_edges_bulk([("e2", "us2", "prop1", "has_property")]) == [], (
+        "Edge with an existing ID was added")
+    assert len(graph.edges) == 3, f"Expected 3 edges, got {len(graph.edges)}"
+    print("  ✓ add_edges_bulk validated 3 edges and skipped duplicate IDs")
+
+
+def test_add_edges_bulk_missing_node_adds_nothing():
+    """A missing endpoint raises ValueError before any edge is added."""
+    graph = _make_graph()
+    try:
+        graph.add_edges_bulk([
+            ("e1", "us1", "us2", "is_after"),
+            ("e2", "us1", "missing", "is_after"),
+        ])
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("add_edges_bulk accepted an edge to a missing node")
+
+    assert graph.edges == [], f"Edges added despite the error: {graph.edges}"
+    assert graph.find_edge_by_id("e1") is None, "e1 indexed despite the error"
+    print("  ✓ add_edges_bulk rejected the batch with a missing node")
+
+
+def test_indices_follow_additions_and_removals():
+    """Indices built before a change answer lookups made after it."""
+    graph = _make_graph()
+    graph.add_edge("e1", "us1", "prop1", "has_property")
+    assert graph.indices.strat_to_properties == {"us1": {"material": "stone"}}
+
+    # Aggiunte dopo la costruzione degli indici
+    graph.add_node(StratigraphicUnit("us3", "US3"))
+    graph.add_edges_bulk([("e2", "us3", "prop1", "has_property")])
+    assert graph.find_node_by_id("us3").name == "US3", "New node not indexed"
+    assert graph.find_edge_by_id("e2") is not None, "New edge not indexed"
+    assert set(graph.indices.strat_to_properties) == {"us1", "us3"}, (
+        f"Property indices not refreshed: {graph.indices.strat_to_properties}")
+
+    # Rimozioni
+    graph.remove_node("us3")
+    assert graph.find_node_by_id("us3") is None, "Removed node still indexed"
+    assert graph.find_edge_by_id("e2") is None, "Edge of removed node still indexed"
+    graph.remove_edge("e1")
+    assert graph.find_edge_by_id("e1") is None, "Removed edge still indexed"
+    assert graph.indices.strat_to_properties == {}, (
+        f"Removed relations still indexed: {graph.indices.strat_to_properties}")
+    us_nodes = [node.node_id for node in graph.get_nodes_by_type("US")]
+    assert us_nodes == ["us1", "us2"], f"Unexpected US nodes: {us_nodes}"
+    print("  ✓ Indices follow additions and removals")
+
+
+def test_has_edge_follows_edge_changes():
+    """has_edge() answers from the indices after every kind of change."""
+    graph = _make_graph()
+    graph.add_node(DocumentNode("doc1", "D.01"))
+    assert not graph.has_edge("us1", "us2", "is_after"), "Edge found in empty graph"
+
+    graph.add_edge("e1", "us1", "us2", "is_after")
+    graph.add_edges_bulk([("e2", "us1", "doc1", "generic_connection")])
+    assert graph.has_edge("us1", "us2", "is_after"), "add_edge() edge not found"
+    assert not graph.has_edge("us2", "us1", "is_after"), "Edge direction ignored"
+    assert graph.has_edge("us1", "doc1", "generic_connection"), "Bulk edge not found"
+
+    # Tipo cambiato sul posto
+    graph.update_edge("e1", edge_type="is_before")
+    assert not graph.has_edge("us1", "us2", "is_after"), "Old type still found"
+    assert graph.has_edge("us1", "us2", "is_before"), "Updated type not found"
+
+    assert graph.refine_edge_types() == 1, "generic_connection to a document not refined"
+    assert graph.has_edge("us1", "doc1", "has_documentation"), "Refined type not found"
+    assert not graph.has_edge("us1", "doc1", "generic_connection"), (
+        "Placeholder type still found after refine_edge_types()")
+
+    graph.remove_edge("e1")
+    assert not graph.has_edge("us1", "us2", "is_before"), "Removed edge still found"
+    print("  ✓ has_edge follows add, update, refine and remove")
+
+
+def test_direct_list_changes_are_detected():
+    """Changes made to graph.nodes/graph.edges directly reach the lookups."""
+    graph = _make_graph()
+    graph.add_edge("e1", "us1", "us2", "is_after")
+    assert graph.find_node_by_id("us1") is not None  # indici costruiti
+
+    graph.nodes.append(StratigraphicUnit("us3", "US3"))
+    assert graph.find_node_by_id("us3") is not None, "Appended node not found"
+    # Aggiunta tramite il grafo dopo una modifica diretta
+    graph.nodes.append(StratigraphicUnit("us4", "US4"))
+    graph.add_node(StratigraphicUnit("us5", "US5"))
+    assert graph.find_node_by_id("us4") is not None, "Appended node missed by add_node()"
+
+    graph.edges = [edge for edge in graph.edges if edge.edge_id != "e1"]
+    assert graph.find_edge_by_id("e1") is None, "Edge of the old list still found"
+    assert not graph.has_edge("us1", "us2", "is_after"), "Edge of the old list still found"
+
+    graph.nodes = [node for node in graph.nodes if node.node_id != "us2"]
+    assert graph.find_node_by_id("us2") is None, "Node of the old list still found"
+    us_nodes = sorted(node.node_id for node in graph.get_nodes_by_type("US"))
+    assert us_nodes == ["us1", "us3", "us4", "us5"], f"Unexpected US nodes: {us_nodes}"
+    print("  ✓ Direct changes to graph.nodes/graph.edges are detected")
+
+
+def run():
+    print("== Graph index tests ==")
+    test_add_nodes_bulk_skips_duplicates()
+    test_add_edges_bulk_validates_and_skips_duplicates()
+    test_add_edges_bulk_missing_node_adds_nothing()
+    test_indices_follow_additions_and_removals()
+    test_has_edge_follows_edge_changes()
+    test_direct_list_changes_are_detected()
+    print("== OK ==")
+
+
+if __name__ == "__main__":
+    run()
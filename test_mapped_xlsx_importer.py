@@ -0,0 +1,238 @@
+"""MappedXLSXImporter regression — values read from the sheet must not
+depend on how the rows are split into chunks or on the Excel reader.
+
+Validates invariants:
+
+1. Epoch dates read from different chunks compare equal, so a period
+   spread over several chunks becomes a single ``EpochNode``.
+2. Columns with a ``data_type`` in the mapping, and epoch START/END
+   dates, are converted to that type (numbers in a date column are Excel
+   serial dates); cells that do not convert are dropped and reported in
+   the importer warnings.
+3. python-calamine and openpyxl import the same sheet to the same
+   values (dates, whole and decimal numbers, empty cells), and keep the
+   sheet row and column positions when the data does not start at A1.
+
+Run with:  python3 test_mapped_xlsx_importer.py
+"""
+
+from __future__ import annotations
+
+import datetime
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent
+sys.path.insert(0, str(REPO_ROOT / "src"))
+
+from openpyxl import Workbook  # noqa: E402
+
+from s3dgraphy.importer import mapped_xlsx_importer  # noqa: E402
+from s3dgraphy.importer.mapped_xlsx_importer import MappedXLSXImporter  # noqa: E402
+from s3dgraphy.mappings import add_custom_mapping_directory  # noqa: E402
+
+
+def _write_workbook(path, sheet_name, rows):
+    workbook = Workbook()
+    worksheet = workbook.active
+    worksheet.title = sheet_name
+    for row in rows:
+        worksheet.append(row)
+    workbook.save(path)
+
+
+def _property_values(graph):
+    return {(node.name, node.value) for node in graph.nodes
+            if getattr(node, 'node_type', None) == 'property'}
+
+
+def test_epoch_dates_do_not_depend_on_chunks():
+    """A chunk with an empty date cell and one without it give the same epoch."""
+    rows = [["ID", "TYPE", "PERIOD", "PERIOD_START", "PERIOD_END"]]
+    for i in range(10):
+        if i == 1:
+            # Celle vuote: to_numeric() darebbe float64 solo per questo chunk
+            rows.append([f"US{i}", "US", None, None, None])
+        elif i % 2:
+            rows.append([f"US{i}", "US", "Romano", -100, 476])
+        else:
+            rows.append([f"US{i}", "US", "Medievale", 476, 1492])
+
+    original_chunk_size = mapped_xlsx_importer._CHUNK_SIZE
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "epochs.xlsx"
+        _write_workbook(path, "Stratigraphy", rows)
+        # Chunk piccoli: le righe sono divise in 3 chunk
+        mapped_xlsx_importer._CHUNK_SIZE = 4
+        try:
+            graph = MappedXLSXImporter(str(path), "excel_to_graphml_mapping").parse()
+        finally:
+            mapped_xlsx_importer._CHUNK_SIZE = original_chunk_size
+
+    epochs = sorted((node.name, node.start_time, node.end_time)
+                    for node in graph.nodes if node.node_type == 'EpochNode')
+    assert epochs == [("Medievale", 476.0, 1492.0), ("Romano", -100.0, 476.0)], (
+        f"Expected one EpochNode per period, got {epochs}")
+    print(f"  ✓ {len(epochs)} EpochNodes across 3 chunks")
+
+
+def test_mapping_data_type_coercion():
+    """Declared data types are applied and invalid cells are reported."""
+    mapping = {
+        "table_settings": {"sheet_name": "Sheet", "start_row": 2},
+        "column_mappings": {
+            "ID": {"node_type": "StratigraphicNode", "is_id": True},
+            "DEPTH": {"node_type": "PropertyNode", "property_name": "depth",
+                      "data_type": "float"},
+            "COUNT": {"node_type": "PropertyNode", "property_name": "count",
+                      "data_type": "integer"},
+            "FOUND": {"node_type": "PropertyNode", "property_name": "found",
+                      "data_type": "date"},
+            "CODE": {"node_type": "PropertyNode", "property_name": "code",
+                     "data_type": "text"},
+        },
+    }
+    rows = [
+        ["ID", "DEPTH", "COUNT", "FOUND", "CODE"],
+        ["US1", 1.5, "3", datetime.datetime(2020, 1, 2), 7],
+        ["US2", "abc", 2.5, "not a date", "x"],
+        # Seriale di Excel in una colonna data: 2020-01-03 12:00
+        ["US3", None, None, 43833.5, None],
+    ]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        (Path(tmp) / "test_data_types_mapping.json").write_text(json.dumps(mapping))
+        add_custom_mapping_directory('generic', tmp)
+        path = Path(tmp) / "types.xlsx"
+        _write_workbook(path, "Sheet", rows)
+        importer = MappedXLSXImporter(str(path), "test_data_types_mapping")
+        graph = importer.parse()
+
+    values = _property_values(graph)
+    expected = {("DEPTH", "1.5"), ("COUNT", "3"),
+                ("FOUND", "2020-01-02 00:00:00"), ("FOUND", "2020-01-03 12:00:00"),
+                ("CODE", "7"), ("CODE", "x")}
+    assert values == expected, f"Unexpected property values: {values}"
+
+    for column, data_type in (("DEPTH", "float"), ("COUNT", "int"), ("FOUND", "date")):
+        warning = f"Column '{column}': 1 value(s) are not a valid {data_type} and were ignored"
+        assert warning in importer.warnings, (
+            f"Missing warning {warning!r} in {importer.warnings}")
+    assert not any("'CODE'" in warning for warning in importer.warnings), (
+        "Every cell converts to text, no CODE warning expected")
+    print(f"  ✓ {len(values)} typed values imported, 3 invalid cells reported")
+
+
+def test_invalid_epoch_dates_are_reported():
+    """A non-numeric epoch date is dropped with a warning, not silently."""
+    rows = [
+        ["ID", "TYPE", "PERIOD", "PERIOD_START", "PERIOD_END"],
+        ["US1", "US", "Romano", -100, 476],
+        ["US2", "US", "Romano", "circa 200 BC", 476],
+    ]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "epoch_dates.xlsx"
+        _write_workbook(path, "Stratigraphy", rows)
+        importer = MappedXLSXImporter(str(path), "excel_to_graphml_mapping")
+        importer.parse()
+
+    warning = "Column 'PERIOD_START': 1 value(s) are not a valid float and were ignored"
+    assert warning in importer.warnings, f"Missing warning {warning!r} in {importer.warnings}"
+    assert not any("'PERIOD_END'" in w for w in importer.warnings), (
+        "Every PERIOD_END is a number, no warning expected")
+    print("  ✓ Non-numeric epoch date reported in the warnings")
+
+
+def test_calamine_and_openpyxl_agree():
+    """Both Excel readers give the same rows and the same graph."""
+    if mapped_xlsx_importer.CalamineWorkbook is None:
+        print("  - python-calamine not installed, skipped")
+        return
+
+    rows = [
+        ["ID", "TYPE", "DESCRIPTION", "PERIOD", "PERIOD_START", "PERIOD_END"],
+        ["US1", "US", datetime.date(2020, 1, 2), "Romano", -100, 476],
+        ["US2", "US", datetime.datetime(2020, 1, 2, 3, 4, 5), "Romano", -100, 476.5],
+        ["US3", "US", None, None, None, None],
+    ]
+
+    def read(path):
+        sheet_rows = [row + (None,) * (len(rows[0]) - len(row))
+                      for row in mapped_xlsx_importer._iter_sheet_rows(str(path), "Stratigraphy", 2)]
+        graph = MappedXLSXImporter(str(path), "excel_to_graphml_mapping").parse()
+        nodes = sorted((node.node_type, node.name, getattr(node, 'description', None))
+                       for node in graph.nodes if node.node_type != 'geo_position')
+        return sheet_rows, nodes
+
+    calamine_workbook = mapped_xlsx_importer.CalamineWorkbook
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "engines.xlsx"
+        _write_workbook(path, "Stratigraphy", rows)
+        calamine_rows, calamine_nodes = read(path)
+        mapped_xlsx_importer.CalamineWorkbook = None
+        try:
+            openpyxl_rows, openpyxl_nodes = read(path)
+        finally:
+            mapped_xlsx_importer.CalamineWorkbook = calamine_workbook
+
+    assert calamine_rows == openpyxl_rows, (
+        f"Rows differ:\n  calamine: {calamine_rows}\n  openpyxl: {openpyxl_rows}")
+    assert calamine_rows[1][2] == datetime.datetime(2020, 1, 2), (
+        f"Date-only cell read as {calamine_rows[1][2]!r}")
+    assert calamine_nodes == openpyxl_nodes, (
+        f"Graphs differ:\n  calamine: {calamine_nodes}\n  openpyxl: {openpyxl_nodes}")
+    print(f"  ✓ calamine and openpyxl agree on {len(calamine_rows)} rows "
+          f"and {len(calamine_nodes)} nodes")
+
+
+def test_calamine_keeps_sheet_positions():
+    """Leading empty rows and columns are kept by both readers."""
+    if mapped_xlsx_importer.CalamineWorkbook is None:
+        print("  - python-calamine not installed, skipped")
+        return
+
+    def read(path, start_row):
+        rows = list(mapped_xlsx_importer._iter_sheet_rows(str(path), 0, start_row))
+        width = max(map(len, rows))
+        return [tuple(row) + (None,) * (width - len(row)) for row in rows]
+
+    calamine_workbook = mapped_xlsx_importer.CalamineWorkbook
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "offset.xlsx"
+        workbook = Workbook()
+        worksheet = workbook.active
+        # Intestazioni dalla colonna C, riga 2 (esempi) da saltare, dati da riga 3
+        worksheet["C1"], worksheet["D1"] = "ID", "TYPE"
+        worksheet["C2"] = "example"
+        worksheet["C3"], worksheet["E4"] = "US1", 2
+        workbook.save(path)
+
+        calamine_rows = read(path, 3)
+        mapped_xlsx_importer.CalamineWorkbook = None
+        try:
+            openpyxl_rows = read(path, 3)
+        finally:
+            mapped_xlsx_importer.CalamineWorkbook = calamine_workbook
+
+    assert calamine_rows == openpyxl_rows, (
+        f"Rows differ:\n  calamine: {calamine_rows}\n  openpyxl: {openpyxl_rows}")
+    assert calamine_rows[:2] == [(None, None, "ID", "TYPE", None),
+                                 (None, None, "US1", None, None)], (
+        f"Column positions not kept: {calamine_rows[:2]}")
+    print(f"  ✓ calamine and openpyxl agree on an offset sheet ({len(calamine_rows)} rows)")
+
+
+def run():
+    print("== MappedXLSXImporter tests ==")
+    test_epoch_dates_do_not_depend_on_chunks()
+    test_mapping_data_type_coercion()
+    test_invalid_epoch_dates_are_reported()
+    test_calamine_and_openpyxl_agree()
+    test_calamine_keeps_sheet_positions()
+    print("== OK ==")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,131 @@
+"""Utility regression — helpers in ``s3dgraphy.utils.utils`` that replace
+per-node loops must report the same data as the graph itself.
+
+Validates invariants:
+
+1. ``iter_graph_debug`` without a node counts every node and edge by
+   type; with a node it lists that node's outgoing and incoming edges,
+   also for edges added after the graph indices were built.
+2. ``iter_graph_debug`` yields nothing for an unknown node.
+3. ``get_material_colors`` gives, row by row, the colour returned by
+   ``get_material_color`` (NaN for names without a material), with the
+   default rules and with a custom rules file.
+
+Run with:  python3 test_utils.py
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+REPO_ROOT = Path(__file__).resolve().parent
+sys.path.insert(0, str(REPO_ROOT / "src"))
+
+from s3dgraphy.graph import Graph  # noqa: E402
+from s3dgraphy.nodes.stratigraphic_node import StratigraphicUnit  # noqa: E402
+from s3dgraphy.utils.utils import (  # noqa: E402
+    get_material_color, get_material_colors, iter_graph_debug,
+)
+
+
+def _make_graph():
+    graph = Graph(graph_id="test_graph")
+    graph.add_nodes_bulk([StratigraphicUnit(f"us{i}", f"US{i}") for i in (1, 2, 3)])
+    graph.add_edges_bulk([
+        ("e1", "us1", "us2", "is_after"),
+        ("e2", "us3", "us1", "is_after"),
+    ])
+    return graph
+
+
+def test_iter_graph_debug_summary():
+    """Without node_id: node and edge totals and per-type counts."""
+    graph = _make_graph()
+    records = list(iter_graph_debug(graph))
+
+    assert records[0] == ("nodes", len(graph.nodes)), f"Unexpected first record: {records[0]}"
+    node_types = dict(payload for kind, payload in records if kind == "node_type")
+    assert node_types == {"geo_position": 1, "US": 3}, f"Unexpected node types: {node_types}"
+    assert ("edges", 2) in records, f"Edge total missing: {records}"
+    edge_types = dict(payload for kind, payload in records if kind == "edge_type")
+    assert edge_types == {"is_after": 2}, f"Unexpected edge types: {edge_types}"
+    print(f"  ✓ Graph summary: {len(records)} records")
+
+
+def test_iter_graph_debug_node():
+    """With node_id: the node, then its outgoing and incoming edges."""
+    graph = _make_graph()
+    graph.indices  # indici costruiti prima dell'ultimo edge
+    graph.add_edge("e3", "us1", "us3", "is_before")
+
+    records = list(iter_graph_debug(graph, "us1"))
+    assert records == [
+        ("node", ("us1", "US", "US1")),
+        ("out_edges", 2),
+        ("out_edge", ("us2", "US", "is_after")),
+        ("out_edge", ("us3", "US", "is_before")),
+        ("in_edges", 1),
+        ("in_edge", ("us3", "US", "is_after")),
+    ], f"Unexpected node records: {records}"
+
+    assert list(iter_graph_debug(graph, "missing")) == [], "Records for an unknown node"
+    print("  ✓ Node records list 2 outgoing and 1 incoming edges")
+
+
+def _assert_rows_match(colors, matnames, rules_path=None):
+    assert colors.shape == (len(matnames), 4), f"Unexpected shape {colors.shape}"
+    assert colors.dtype.name == "float32", f"Unexpected dtype {colors.dtype}"
+    for row, matname in zip(colors.tolist(), matnames):
+        expected = get_material_color(matname, rules_path)
+        if expected is None:
+            assert all(math.isnan(value) for value in row), (
+                f"{matname}: expected NaN row, got {row}")
+        else:
+            assert row == np.array(expected, dtype=np.float32).tolist(), (
+                f"{matname}: expected {expected}, got {row}")
+
+
+def test_get_material_colors_default_rules():
+    """Bulk colours match get_material_color() for each name."""
+    matnames = ["US", "USVs", "US", "EpochNode", "not_a_type"]
+    colors = get_material_colors(matnames)
+    _assert_rows_match(colors, matnames)
+    assert not math.isnan(colors[0, 0]), "US should have a material colour"
+    assert get_material_colors([]).shape == (0, 4), "Empty input should give a (0, 4) array"
+    print(f"  ✓ {len(matnames)} default-rule colours match get_material_color")
+
+
+def test_get_material_colors_custom_rules():
+    """A custom rules file is used for every name."""
+    rules = {"node_styles": {
+        "US": {"style": {"material": {"color": {"r": 0.25, "g": 0.5, "b": 0.75}}}},
+        "USVs": {"style": {}},
+    }}
+    matnames = ["US", "USVs"]
+    with tempfile.TemporaryDirectory() as tmp:
+        rules_path = str(Path(tmp) / "rules.json")
+        Path(rules_path).write_text(json.dumps(rules))
+        colors = get_material_colors(matnames, rules_path)
+        _assert_rows_match(colors, matnames, rules_path)
+
+    assert colors[0].tolist() == [0.25, 0.5, 0.75, 1.0], f"Unexpected US colour {colors[0]}"
+    print("  ✓ Custom rules file colours match get_material_color")
+
+
+def run():
+    print("== Utils tests ==")
+    test_iter_graph_debug_summary()
+    test_iter_graph_debug_node()
+    test_get_material_colors_default_rules()
+    test_get_material_colors_custom_rules()
+    print("== OK ==")
+
+
+if __name__ == "__main__":
+    run()